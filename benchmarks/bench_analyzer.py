@@ -0,0 +1,80 @@
+"""Microbenchmark of ContentAnalyzer.analyze over a mixed payload corpus.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_analyzer
+    python -m benchmarks.bench_analyzer --baseline <git revision or path to content_analyzer.py>
+
+With --baseline, the same corpus is classified by that version of the analyzer as well and
+the per-type speedup is reported.
+"""
+import argparse
+import os
+import subprocess
+import timeit
+import types
+from core.content_analyzer import ContentAnalyzer
+
+# (label, payload, relative frequency in the mixed corpus)
+CORPUS = [
+    ('Text', 'Order 4711 shipped on Monday, handle with care', 30),
+    ('Text', 'x' * 300, 5),
+    ('Phone', '+420 123 456 789', 15),
+    ('Phone', 'tel:+420123456789', 5),
+    ('URL', 'https://example.com/products/42?ref=qr&lang=en#specs', 20),
+    ('Email', 'sales@example.com', 5),
+    ('Email', 'mailto:sales@example.com?subject=Hello&body=Line%0AOther', 3),
+    ('SMS', 'smsto:+420123456789:Ticket 42', 3),
+    ('WiFi Configuration', 'WIFI:S:Office;T:WPA;P:secret;H:false;;', 5),
+    ('vCard', 'BEGIN:VCARD\nVERSION:3.0\nN:Doe;John;;Mr.;\nFN:John Doe\nORG:Example\n'
+              'TEL;WORK;VOICE:+420123456789\nEMAIL;WORK;INTERNET:john@example.com\n'
+              'ADR;WORK:;;Main 1;Prague;;11000;CZ\nURL:https://example.com\nEND:VCARD', 3),
+    ('Bitcoin Payment', 'bitcoin:1BoatSLRHtKNngkdXEeobR76b53LETtpyT?amount=0.5&label=Order', 2),
+    ('Geographic Location', 'geo:50.0755,14.4378;u=35', 2),
+    ('JSON', '{"id": 42, "items": [1, 2, 3], "paid": true}', 2)
+]
+
+def load_analyzer(baseline):
+    """Load ContentAnalyzer from a file path or from core/content_analyzer.py at a git revision."""
+    if os.path.isfile(baseline):
+        with open(baseline, encoding='utf-8') as f:
+            source = f.read()
+    else:
+        source = subprocess.run(
+            ['git', 'show', f'{baseline}:core/content_analyzer.py'],
+            capture_output=True, text=True, check=True
+        ).stdout
+    module = types.ModuleType('baseline_content_analyzer')
+    exec(compile(source, f'{baseline}:core/content_analyzer.py', 'exec'), module.__dict__)
+    return module.ContentAnalyzer
+
+def per_call_ns(analyzer, payloads, number):
+    timer = timeit.Timer(lambda: [analyzer.analyze(payload) for payload in payloads])
+    return min(timer.repeat(repeat=5, number=number)) / (number * len(payloads)) * 1e9
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--baseline', type=str, default=None,
+                        help='Git revision or file path of the analyzer to compare against')
+    parser.add_argument('--number', type=int, default=2000, help='Corpus passes per timing run')
+    args = parser.parse_args()
+
+    baseline = load_analyzer(args.baseline) if args.baseline else None
+    mixed = [payload for _, payload, weight in CORPUS for _ in range(weight)]
+
+    rows = [(label, [payload]) for label, payload, _ in CORPUS] + [('mixed corpus', mixed)]
+    header = f"{'payload':<22} {'current':>10}"
+    if baseline:
+        header += f" {'baseline':>10} {'speedup':>8}"
+    print(header)
+    for label, payloads in rows:
+        number = max(1, args.number * len(mixed) // (len(payloads) * 10))
+        current = per_call_ns(ContentAnalyzer, payloads, number)
+        line = f"{label:<22} {current:>7.0f} ns"
+        if baseline:
+            previous = per_call_ns(baseline, payloads, number)
+            line += f" {previous:>7.0f} ns {previous / current:>7.2f}x"
+        print(line)
+
+if __name__ == "__main__":
+    main()
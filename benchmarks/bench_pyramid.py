@@ -0,0 +1,52 @@
+"""Latency of full-frame vs. pyramid (coarse-to-fine) decoding on large synthetic scans.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_pyramid --sizes 12 24 50 --repeat 5
+"""
+import argparse
+import statistics
+import time
+import numpy as np
+import qrcode
+from core.qr_extractor import extract_all_qr
+
+def make_scan(megapixels, codes=2, box_size=12, seed=0):
+    """Build a noisy 4:3 grayscale page of the given size with a few QR codes pasted on it."""
+    rng = np.random.default_rng(seed)
+    width = int((megapixels * 1e6 * 4 / 3) ** 0.5)
+    height = int(width * 3 / 4)
+    page = rng.integers(150, 230, (height, width), dtype=np.uint8)
+    for index in range(codes):
+        code = np.array(qrcode.make(f"benchmark code {index}", box_size=box_size).convert('L'))
+        x = int(rng.integers(0, width - code.shape[1]))
+        y = int(rng.integers(0, height - code.shape[0]))
+        page[y:y + code.shape[0], x:x + code.shape[1]] = code
+    return page
+
+def time_extract(page, repeat, **options):
+    timings = []
+    found = 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        found = len(extract_all_qr(page, **options))
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings), found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--sizes', type=float, nargs='+', default=[12, 24, 50], help='Page sizes in megapixels')
+    parser.add_argument('--codes', type=int, default=2, help='QR codes per page')
+    parser.add_argument('--repeat', type=int, default=3, help='Runs per measurement (median reported)')
+    args = parser.parse_args()
+
+    print(f"{'MP':>6} {'full frame':>12} {'pyramid':>12} {'speedup':>8} {'codes':>7}")
+    for megapixels in args.sizes:
+        page = make_scan(megapixels, args.codes)
+        full, full_found = time_extract(page, args.repeat, cascade=('raw',))
+        pyramid, pyramid_found = time_extract(page, args.repeat, cascade=('raw',), pyramid=True)
+        print(f"{megapixels:>6.1f} {full * 1000:>9.0f} ms {pyramid * 1000:>9.0f} ms "
+              f"{full / pyramid:>7.1f}x {full_found:>3}/{pyramid_found}")
+
+if __name__ == "__main__":
+    main()
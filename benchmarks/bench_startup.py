@@ -0,0 +1,78 @@
+"""Startup time of the CLI entry point for invocations that should stay light.
+
+Run from the repository root:
+
+    python -m benchmarks.bench_startup
+    python -m benchmarks.bench_startup --command dist/QRebuild-CLI.exe
+
+Each case is run as a fresh process and the median wall time is reported. For the Python
+entry point, a -X importtime run also lists which heavy dependencies the case imported and
+their cumulative import time; --help and analyze should show none.
+"""
+import argparse
+import os
+import shlex
+import statistics
+import subprocess
+import sys
+import time
+
+# Modules that dominate startup when imported
+HEAVY_MODULES = ('cv2', 'numpy', 'PIL', 'qrcode', 'pyzbar', 'PyQt6')
+
+# (label, CLI arguments)
+CASES = [
+    ('--help', ['--help']),
+    ('analyze', ['analyze', 'https://example.com/products/42?ref=qr']),
+    ('analyze --format csv', ['analyze', '--format', 'csv', 'WIFI:S:Office;T:WPA;P:secret;;']),
+    # Reference: loads the whole decode/encode stack before failing on the missing file
+    ('rebuild (no such file)', ['-i', 'no_such_image.png', '-o', 'no_such_output.png'])
+]
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def wall_ms(command, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL, check=False)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+def heavy_imports(arguments):
+    """Cumulative import time in ms of each heavy top-level module imported by cli_main."""
+    process = subprocess.run(
+        [sys.executable, '-X', 'importtime', os.path.join(ROOT, 'cli_main.py')] + arguments,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=False
+    )
+    found = {}
+    for line in process.stderr.splitlines():
+        # "import time:      self [us] |    cumulative | imported package"
+        parts = line.split('|')
+        if len(parts) != 3 or not line.startswith('import time:'):
+            continue
+        name = parts[2].strip()
+        if name in HEAVY_MODULES:
+            found[name] = int(parts[1]) / 1000
+    return found
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--command', type=str, default=None,
+                        help='Entry point to run, e.g. a PyInstaller build\n(default: python cli_main.py)')
+    parser.add_argument('--repeat', type=int, default=10, help='Runs per case (default: 10)')
+    args = parser.parse_args()
+
+    prefix = shlex.split(args.command) if args.command else [sys.executable, os.path.join(ROOT, 'cli_main.py')]
+    baseline = wall_ms([sys.executable, '-c', 'pass'], args.repeat)
+    print(f"{'case':<22} {'median':>10}   heavy imports")
+    print(f"{'bare interpreter':<22} {baseline:>7.1f} ms")
+    for label, arguments in CASES:
+        median = wall_ms(prefix + arguments, args.repeat)
+        imports = '' if args.command else ', '.join(
+            f"{name} {ms:.0f} ms" for name, ms in heavy_imports(arguments).items()
+        ) or 'none'
+        print(f"{label:<22} {median:>7.1f} ms   {imports}")
+
+if __name__ == "__main__":
+    main()
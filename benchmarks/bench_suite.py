@@ -0,0 +1,200 @@
+"""Extract / generate / analyze benchmark over the synthetic corpus, with JSON results.
+
+Run from the repository root and keep the JSON to compare commits:
+
+    python -m benchmarks.bench_suite --output before.json
+    git checkout my-branch
+    python -m benchmarks.bench_suite --output after.json --compare before.json
+
+Per stage it reports decode rate (extract only), latency percentiles, throughput and the
+tracemalloc peak. The peak covers Python and NumPy allocations, not OpenCV/zbar internals.
+"""
+import argparse
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from collections import defaultdict
+import cv2
+import numpy as np
+from core.qr_extractor import extract_all_qr
+from core.qr_generator import encode_qr, generate_qr
+from core.content_analyzer import ContentAnalyzer
+from benchmarks.corpus import PAYLOADS, DEFAULT_VERSIONS, DEFAULT_LEVELS, DEFAULT_DEGRADATIONS, build_corpus
+
+def _percentiles(timings):
+    if len(timings) == 1:
+        return timings[0], timings[0], timings[0]
+    cuts = statistics.quantiles(timings, n=100, method='inclusive')
+    return statistics.median(timings), cuts[89], cuts[98]
+
+def measure(calls):
+    """Time each call, then run them all again under tracemalloc for the peak.
+
+    calls is a list of zero-argument callables; returns (stats dict, results of the timed run).
+    """
+    timings = []
+    results = []
+    for call in calls:
+        start = time.perf_counter()
+        results.append(call())
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    for call in calls:
+        call()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    p50, p90, p99 = _percentiles(timings)
+    total = sum(timings)
+    return {
+        'count': len(calls),
+        'latency_ms': {'p50': p50 * 1000, 'p90': p90 * 1000, 'p99': p99 * 1000, 'max': max(timings) * 1000},
+        'throughput_per_s': len(calls) / total if total else None,
+        'peak_memory_kb': peak / 1024
+    }, results
+
+def bench_extract(corpus, cascade=None):
+    """One stage per degradation: decode every image and check the expected payload came out."""
+    options = {'cascade': cascade} if cascade else {}
+    groups = defaultdict(list)
+    for item in corpus:
+        groups[item.degradation].append(item)
+
+    stages = {}
+    for degradation, items in groups.items():
+        calls = [lambda image=item.image: extract_all_qr(image, **options) for item in items]
+        stats, results = measure(calls)
+        decoded = 0
+        winning = defaultdict(int)
+        for item, found in zip(items, results):
+            payloads = {result.data for result in found}
+            if item.payload.encode('utf-8') in payloads:
+                decoded += 1
+                winning[found[0].stage or 'raw'] += 1
+        stats['decode_rate'] = decoded / len(items)
+        stats['decoded_by_stage'] = dict(winning)
+        stages[f'extract/{degradation}'] = stats
+    return stages
+
+def bench_generate(corpus):
+    """Encode + render per version, with the encode cache cleared so every call does the work."""
+    groups = defaultdict(set)
+    for item in corpus:
+        groups[item.version].add((item.payload, item.level))
+
+    stages = {}
+    for version in sorted(groups):
+        cases = sorted(groups[version])
+
+        def call(payload, level):
+            encode_qr.cache_clear()
+            return generate_qr(payload, 10, 4, level)
+
+        stats, _ = measure([lambda case=case: call(*case) for case in cases])
+        stages[f'generate/v{version}'] = stats
+    return stages
+
+def bench_analyze(corpus, repeat=200):
+    """Classify and fully parse/format each payload type repeat times."""
+    payloads = {}
+    for item in corpus:
+        if item.kind in PAYLOADS:
+            payloads.setdefault(item.kind, item.payload)
+
+    stages = {}
+    for kind, payload in payloads.items():
+        stats, _ = measure([lambda: ContentAnalyzer.analyze(payload).format()] * repeat)
+        stages[f'analyze/{kind}'] = stats
+    return stages
+
+def environment():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+                                check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+    return {
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'python': sys.version.split()[0],
+        'platform': platform.platform(),
+        'numpy': np.__version__,
+        'opencv': cv2.__version__
+    }
+
+def compare(current, baseline, file=sys.stdout):
+    """Print p50 latency and decode rate changes against a previous results file."""
+    print(f"{'stage':<24} {'p50 before':>11} {'p50 after':>10} {'change':>8} {'decode rate':>14}", file=file)
+    for stage, stats in current['stages'].items():
+        before = baseline['stages'].get(stage)
+        if before is None:
+            continue
+        p50_before = before['latency_ms']['p50']
+        p50_after = stats['latency_ms']['p50']
+        change = (p50_after / p50_before - 1) * 100 if p50_before else 0
+        rate = ''
+        if 'decode_rate' in stats:
+            rate = f"{before['decode_rate']:.0%} -> {stats['decode_rate']:.0%}"
+        print(f"{stage:<24} {p50_before:>8.2f} ms {p50_after:>7.2f} ms {change:>+7.1f}% {rate:>14}", file=file)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--seed', type=int, default=0, help='Corpus RNG seed (default: 0)')
+    parser.add_argument('--versions', type=int, nargs='+', default=list(DEFAULT_VERSIONS),
+                        help='QR versions to include besides the payload types')
+    parser.add_argument('--levels', nargs='+', default=list(DEFAULT_LEVELS), choices=DEFAULT_LEVELS,
+                        help='Error correction levels')
+    parser.add_argument('--degradations', nargs='+', default=list(DEFAULT_DEGRADATIONS),
+                        choices=DEFAULT_DEGRADATIONS, help='Degradations applied to every code')
+    parser.add_argument('--preprocess', type=str, default=None,
+                        help='Comma-separated extraction cascade (default: the full cascade)')
+    parser.add_argument('--stages', nargs='+', default=['extract', 'generate', 'analyze'],
+                        choices=['extract', 'generate', 'analyze'], help='Benchmarks to run')
+    parser.add_argument('--output', type=str, default=None, help='Write the JSON results here (default: stdout)')
+    parser.add_argument('--compare', type=str, default=None, help='Previous JSON results to compare against')
+    args = parser.parse_args()
+
+    corpus = list(build_corpus(args.seed, args.versions, args.levels, args.degradations))
+    cascade = None
+    if args.preprocess:
+        from core.qr_extractor import parse_cascade
+        cascade = parse_cascade(args.preprocess)
+
+    stages = {}
+    if 'extract' in args.stages:
+        stages.update(bench_extract(corpus, cascade))
+    if 'generate' in args.stages:
+        stages.update(bench_generate(corpus))
+    if 'analyze' in args.stages:
+        stages.update(bench_analyze(corpus))
+
+    results = {
+        'environment': environment(),
+        'corpus': {
+            'seed': args.seed,
+            'images': len(corpus),
+            'versions': args.versions,
+            'levels': args.levels,
+            'degradations': args.degradations
+        },
+        'stages': stages
+    }
+    text = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(text + '\n')
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            # Keep stdout pure JSON when the results go there
+            compare(results, json.load(f), sys.stdout if args.output else sys.stderr)
+
+if __name__ == "__main__":
+    main()
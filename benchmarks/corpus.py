@@ -0,0 +1,132 @@
+"""Reproducible synthetic QR corpus: payload types x versions x error correction x degradations.
+
+Every image is rendered with the project's own generator and degraded with a seeded RNG, so
+the same arguments always give the same pixels. Write it to disk for inspection with:
+
+    python -m benchmarks.corpus --output corpus/
+"""
+import argparse
+import json
+import os
+import zlib
+from collections import namedtuple
+import cv2
+import numpy as np
+from core.qr_generator import encode_qr, generate_qr
+
+# Payloads per content type, covering each ContentAnalyzer handler
+PAYLOADS = {
+    'url': 'https://example.com/products/42?ref=qr&lang=en#specs',
+    'wifi': 'WIFI:S:Office;T:WPA;P:correct horse battery staple;H:false;;',
+    'vcard': 'BEGIN:VCARD\nVERSION:3.0\nN:Doe;John;;Mr.;\nFN:John Doe\nORG:Example\n'
+             'TEL;WORK;VOICE:+420123456789\nEMAIL;WORK;INTERNET:john@example.com\nEND:VCARD',
+    'email': 'mailto:sales@example.com?subject=Order%2042',
+    'phone': '+420 123 456 789',
+    'geo': 'geo:50.0755,14.4378;u=35',
+    'json': '{"id": 42, "items": [1, 2, 3], "paid": true}',
+    'text': 'Order 4711 shipped on Monday, handle with care'
+}
+
+DEFAULT_VERSIONS = (2, 5, 10, 20)
+DEFAULT_LEVELS = ('L', 'M', 'Q', 'H')
+DEFAULT_DEGRADATIONS = ('clean', 'blur', 'noise', 'perspective', 'jpeg', 'scale')
+
+# Pixels per module of the rendered codes and light margin around them
+BOX_SIZE = 6
+MARGIN = 32
+
+CorpusItem = namedtuple('CorpusItem', 'name kind payload version level degradation image')
+
+def version_of(matrix):
+    return (matrix.shape[0] - 17) // 4
+
+def payload_for_version(version, level):
+    """Shortest text payload that encodes at exactly the given version and level."""
+    filler = 'qrebuild benchmark payload 0123456789 '
+    low, high = 1, 3000
+    while low < high:
+        middle = (low + high) // 2
+        text = (filler * (middle // len(filler) + 1))[:middle]
+        try:
+            fits = version_of(encode_qr(text, level)) < version
+        except ValueError:
+            # Longer than version 40 holds at this level
+            fits = False
+        if fits:
+            low = middle + 1
+        else:
+            high = middle
+    return (filler * (low // len(filler) + 1))[:low]
+
+def _blur(image, rng):
+    return cv2.GaussianBlur(image, (0, 0), sigmaX=float(rng.uniform(1.0, 1.8)))
+
+def _noise(image, rng):
+    noisy = image.astype(np.int16) + rng.normal(0, 28, image.shape).astype(np.int16)
+    return np.clip(noisy, 0, 255).astype(np.uint8)
+
+def _perspective(image, rng):
+    height, width = image.shape
+    corners = np.float32([[0, 0], [width, 0], [width, height], [0, height]])
+    jitter = rng.uniform(-0.08, 0.08, (4, 2)) * [width, height]
+    matrix = cv2.getPerspectiveTransform(corners, np.float32(corners + jitter))
+    return cv2.warpPerspective(image, matrix, (width, height), borderValue=235)
+
+def _jpeg(image, rng):
+    _, encoded = cv2.imencode('.jpg', image, [cv2.IMWRITE_JPEG_QUALITY, int(rng.integers(8, 20))])
+    return cv2.imdecode(encoded, cv2.IMREAD_GRAYSCALE)
+
+def _scale(image, rng):
+    # About two pixels per module, the lower limit of a typical phone snapshot
+    factor = float(rng.uniform(0.3, 0.4))
+    return cv2.resize(image, None, fx=factor, fy=factor, interpolation=cv2.INTER_AREA)
+
+# Degradation name -> transform(gray image, rng)
+DEGRADATIONS = {
+    'clean': lambda image, rng: image,
+    'blur': _blur,
+    'noise': _noise,
+    'perspective': _perspective,
+    'jpeg': _jpeg,
+    'scale': _scale
+}
+
+def render_clean(payload, level):
+    code = np.asarray(generate_qr(payload, BOX_SIZE, 4, level).convert('L'))
+    return cv2.copyMakeBorder(code, MARGIN, MARGIN, MARGIN, MARGIN, cv2.BORDER_CONSTANT, value=235)
+
+def build_corpus(seed=0, versions=DEFAULT_VERSIONS, levels=DEFAULT_LEVELS, degradations=DEFAULT_DEGRADATIONS):
+    """Yield CorpusItems for every payload type and version at every level and degradation.
+
+    Each image gets its own RNG seeded from seed and its name, so a subset of the corpus has
+    the same pixels as in the full one.
+    """
+    cases = [(kind, payload) for kind, payload in PAYLOADS.items()]
+    for level in levels:
+        sources = cases + [(f'v{version}', payload_for_version(version, level)) for version in versions]
+        for kind, payload in sources:
+            clean = render_clean(payload, level)
+            version = version_of(encode_qr(payload, level))
+            for degradation in degradations:
+                name = f'{kind}_{level}_{degradation}'
+                rng = np.random.default_rng([seed, zlib.crc32(name.encode('ascii'))])
+                image = DEGRADATIONS[degradation](clean, rng)
+                yield CorpusItem(name, kind, payload, version, level, degradation, image)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawTextHelpFormatter)
+    parser.add_argument('--output', type=str, required=True, help='Directory for the PNGs and manifest.json')
+    parser.add_argument('--seed', type=int, default=0, help='RNG seed (default: 0)')
+    args = parser.parse_args()
+
+    os.makedirs(args.output, exist_ok=True)
+    manifest = []
+    for item in build_corpus(args.seed):
+        cv2.imwrite(os.path.join(args.output, item.name + '.png'), item.image)
+        manifest.append({key: value for key, value in item._asdict().items() if key != 'image'})
+    with open(os.path.join(args.output, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    print(f"Wrote {len(manifest)} images to {args.output}")
+
+if __name__ == "__main__":
+    main()
@@ -3,22 +3,50 @@ import argparse
 def setup_argparser():
     """Configure command line argument parser."""
     parser = argparse.ArgumentParser(
-        description='QR Code Rebuilder: Extract a QR code from an image and generate a clean version.',
+        description='QR Code Rebuilder: Extract a QR code from an image and generate a clean version.\n'
+                    'Pass several files, a directory or a glob pattern to rebuild a whole batch.\n'
+                    'Run "%(prog)s analyze --help" to classify decoded QR content without images\n'
+                    'and "%(prog)s generate --help" to create codes from a CSV or JSONL file.',
         formatter_class=argparse.RawTextHelpFormatter
     )
     
     parser.add_argument(
         '-i', '--input', 
         type=str, 
-        default="qr_code_photo.jpg",
-        help='Path to input image containing QR code\n(default: qr_code_photo.jpg)'
+        nargs='+',
+        default=["qr_code_photo.jpg"],
+        help='Input image(s), directories or glob patterns containing QR codes\n(default: qr_code_photo.jpg)'
+    )
+    
+    parser.add_argument(
+        '--input-list',
+        type=str,
+        help='Text file with one input image path per line (enables batch mode)'
     )
     
     parser.add_argument(
         '-o', '--output', 
         type=str, 
-        default="clean_qr_output.png",
-        help='Path to save the clean QR code\n(default: clean_qr_output.png)'
+        default=None,
+        help='Path to save the clean QR code (.png, .jpg, .svg, .eps, .pdf, ...).\n'
+             'In batch mode: an output directory, a .zip / .tar / .tar.gz archive\n'
+             'or a multi-page .pdf\n'
+             '(default: clean_qr_output.png / clean_qr_output)'
+    )
+    
+    parser.add_argument(
+        '-f', '--format',
+        type=str,
+        choices=['png', 'jpg', 'bmp', 'svg', 'eps'],
+        default=None,
+        help='File format of each code in batch directory or archive output\n(default: png)'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes for batch mode\n(default: number of CPUs)'
     )
     
     parser.add_argument(
@@ -43,10 +71,341 @@ def setup_argparser():
         help='Error correction level (L, M, Q, H)\n(default: H)'
     )
     
+    parser.add_argument(
+        '-p', '--preprocess',
+        type=str,
+        default=None,
+        help='Comma-separated preprocessing cascade tried in order until a code decodes\n'
+             'Stages: raw, downscale, invert, clahe, adaptive_threshold, rotate_45, opencv\n'
+             '(default: all stages in that order)'
+    )
+    
+    parser.add_argument(
+        '--pyramid',
+        action='store_true',
+        help='Coarse-to-fine decoding for large scans: locate codes on a downscaled copy\n'
+             'and decode only the full-resolution regions around them'
+    )
+    
+    parser.add_argument(
+        '--max-side',
+        type=int,
+        default=None,
+        help='Maximum longest side in pixels of any image region passed to the decoder\n'
+             '(default: 2048 with --pyramid, unlimited otherwise)'
+    )
+    
+    parser.add_argument(
+        '--cache',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='SQLite file caching decode results by image content and decoder settings,\n'
+             'so images already decoded in earlier runs are not decoded again\n(default: no cache)'
+    )
+
+    parser.add_argument(
+        '--cache-size',
+        type=int,
+        default=256,
+        metavar='MB',
+        help='Size limit of the decode cache; least recently used entries are evicted\n(default: 256)'
+    )
+
+    parser.add_argument(
+        '-a', '--all',
+        action='store_true',
+        help='Rebuild every QR code found in the image\n(outputs are numbered _1, _2, ... when there are several)'
+    )
+    
     parser.add_argument(
         '-d', '--display',
         action='store_true',
         help='Display the generated QR code'
     )
     
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Re-decode every rebuilt code from memory and compare the payload\n'
+             'byte for byte; codes that differ are reported as failures'
+    )
+    
+    parser.add_argument(
+        '--verify-every',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Verify only every Nth file of a batch (implies --verify)\n(default: 1)'
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Time every stage (load, decode, encode, serialize, save, ...) and print\n'
+             'a per-stage breakdown to stderr at the end of the run'
+    )
+    
+    parser.add_argument(
+        '--metrics-out',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Write the collected stage metrics to PATH: Prometheus text format for\n'
+             '.prom / .txt, a JSON snapshot otherwise (implies metric collection)'
+    )
+    
+    parser.add_argument(
+        '--trace',
+        type=str,
+        default=None,
+        metavar='PATH',
+        help='Write every timed stage as one JSON line to PATH, followed by a\n'
+             'final metrics snapshot line (implies metric collection)'
+    )
+    
+    video = parser.add_argument_group('video and camera streams')
+    
+    video.add_argument(
+        '--video',
+        type=str,
+        default=None,
+        help='Decode a video file or capture device index instead of images;\n'
+             'prints one JSON line per (deduplicated) QR sighting'
+    )
+    
+    video.add_argument(
+        '--stride',
+        type=int,
+        default=1,
+        help='Decode every Nth frame\n(default: 1)'
+    )
+    
+    video.add_argument(
+        '--motion-threshold',
+        type=float,
+        default=2.0,
+        help='Skip frames whose mean pixel change is below this value, 0 to disable\n(default: 2.0)'
+    )
+    
+    video.add_argument(
+        '--dedup-window',
+        type=float,
+        default=5.0,
+        help='Seconds a payload must be absent before it is reported again\n(default: 5.0)'
+    )
+    
+    return parser
+
+def setup_analyze_argparser():
+    """Configure command line argument parser for the analyze subcommand."""
+    parser = argparse.ArgumentParser(
+        prog='QRebuild-CLI analyze',
+        description='Classify QR code content (URL, WiFi, vCard, e-mail, ...) and print its fields.\n'
+                    'Reads the payloads from the arguments or, without any, from stdin.',
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    
+    parser.add_argument(
+        'content',
+        type=str,
+        nargs='*',
+        help='Payloads to analyze\n(default: read stdin)'
+    )
+    
+    parser.add_argument(
+        '-l', '--lines',
+        action='store_true',
+        help='Treat every stdin line as a separate payload\n(default: the whole input is one payload)'
+    )
+    
+    parser.add_argument(
+        '--format',
+        type=str,
+        choices=['text', 'json', 'csv'],
+        default='text',
+        help='text: readable fields, json: one JSON object per line,\n'
+             'csv: one summary row per payload\n(default: text)'
+    )
+    
+    return parser
+
+def verify_interval(parser, args):
+    """Check every how many files or rows to verify, from --verify / --verify-every (0 = off)."""
+    if args.verify_every is None:
+        return 1 if args.verify else 0
+    if args.verify_every < 1:
+        parser.error("--verify-every must be at least 1")
+    return args.verify_every
+
+def _version_arg(value):
+    if value == 'auto':
+        return value
+    try:
+        version = int(value)
+    except ValueError:
+        version = 0
+    if not 1 <= version <= 40:
+        raise argparse.ArgumentTypeError(f"expected 'auto' or a version from 1 to 40, got {value!r}")
+    return version
+
+def setup_generate_argparser():
+    """Configure command line argument parser for the generate subcommand."""
+    parser = argparse.ArgumentParser(
+        prog='QRebuild-CLI generate',
+        description='Generate one QR code per row of a CSV or JSONL file, in parallel.',
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    
+    parser.add_argument(
+        'input',
+        type=str,
+        help='CSV file with a header row or JSONL file with one object per line,\n'
+             '- for stdin'
+    )
+    
+    parser.add_argument(
+        '-o', '--output',
+        type=str,
+        default='generated_qr',
+        help='Output directory, .zip / .tar / .tar.gz archive or multi-page .pdf\n(default: generated_qr)'
+    )
+    
+    parser.add_argument(
+        '--input-format',
+        type=str,
+        choices=['csv', 'jsonl'],
+        default=None,
+        help='Row format\n(default: from the extension, csv for stdin)'
+    )
+    
+    parser.add_argument(
+        '--field',
+        type=str,
+        default='data',
+        help='Column or key holding the QR payload\n(default: data)'
+    )
+    
+    parser.add_argument(
+        '-n', '--name',
+        type=str,
+        default='{index:05d}',
+        help='Output name template without extension; {index} is the row number\n'
+             'and every column is available, e.g. "tickets/{event}-{seat}"\n(default: {index:05d})'
+    )
+    
+    parser.add_argument(
+        '--qr-version',
+        type=_version_arg,
+        default=None,
+        metavar='VERSION',
+        help='Pin the QR version (1-40) for every code, or "auto" for the smallest\n'
+             'version that fits the whole batch, so all codes share one size\n'
+             '(default: smallest version per code)'
+    )
+    
+    parser.add_argument(
+        '-f', '--format',
+        type=str,
+        choices=['png', 'jpg', 'bmp', 'svg', 'eps'],
+        default=None,
+        help='File format of each code in directory or archive output\n(default: png)'
+    )
+    
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=None,
+        help='Number of worker processes\n(default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='Re-decode every generated code from memory and fail rows whose\n'
+             'payload doesn\'t read back byte for byte'
+    )
+    
+    parser.add_argument(
+        '--verify-every',
+        type=int,
+        default=None,
+        metavar='N',
+        help='Verify only every Nth row (implies --verify)\n(default: 1)'
+    )
+    
+    parser.add_argument(
+        '-b', '--box_size',
+        type=int,
+        default=10,
+        help='Size of each QR code module in pixels\n(default: 10)'
+    )
+    
+    parser.add_argument(
+        '--border',
+        type=int,
+        default=4,
+        help='Number of modules for QR code border\n(default: 4)'
+    )
+    
+    parser.add_argument(
+        '-e', '--error_correction',
+        type=str,
+        choices=['L', 'M', 'Q', 'H'],
+        default='H',
+        help='Error correction level (L, M, Q, H)\n(default: H)'
+    )
+    
+    return parser
+
+def setup_serve_argparser():
+    """Configure command line argument parser for the HTTP decode service."""
+    parser = argparse.ArgumentParser(
+        description='QR Code Rebuilder service: /extract, /rebuild and /analyze over local HTTP,\n'
+                    'served by a pool of pre-warmed worker processes.',
+        formatter_class=argparse.RawTextHelpFormatter
+    )
+    
+    parser.add_argument(
+        '--host',
+        type=str,
+        default='127.0.0.1',
+        help='Address to bind\n(default: 127.0.0.1)'
+    )
+    
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=8080,
+        help='Port to listen on (0 picks a free port)\n(default: 8080)'
+    )
+    
+    parser.add_argument(
+        '-w', '--workers',
+        type=int,
+        default=None,
+        help='Number of warm worker processes\n(default: number of CPUs)'
+    )
+    
+    parser.add_argument(
+        '--max-pending',
+        type=int,
+        default=None,
+        help='Requests allowed in flight before answering 503 Retry-After\n(default: 2 x workers)'
+    )
+    
+    parser.add_argument(
+        '--max-body',
+        type=int,
+        default=50 * 1024 * 1024,
+        help='Largest accepted request body in bytes\n(default: 50 MiB)'
+    )
+    
+    parser.add_argument(
+        '--timeout',
+        type=float,
+        default=60,
+        help='Seconds a request may wait for its result\n(default: 60)'
+    )
+    
     return parser
\ No newline at end of file
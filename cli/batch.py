@@ -0,0 +1,187 @@
+import glob
+import os
+import time
+from collections import namedtuple, deque, Counter
+from itertools import islice
+
+# Outcome of one input file; payloads holds (output name, encoded code) pairs for the sink,
+# metrics the worker's stage timings for the file when profiling and verified the round-trip
+# check (None when the file wasn't sampled), timed separately in verify_seconds
+FileResult = namedtuple('FileResult', 'input_path data stage payloads error seconds metrics verified verify_seconds',
+                        defaults=(None, None, None))
+
+# Chunks kept in flight per worker, so finished payloads never pile up in memory
+WINDOW_PER_JOB = 4
+
+def is_batch_input(inputs, input_list=None):
+    """Return True when the inputs describe more than one plain image file."""
+    if input_list or len(inputs) > 1:
+        return True
+    return os.path.isdir(inputs[0]) or glob.has_magic(inputs[0])
+
+def _init_worker(trace=False):
+    """Import the decode/encode stack once per worker process.
+
+    With trace, span events are kept and shipped to the parent with each file's metrics.
+    """
+    import core.pipeline  # noqa: F401
+    import core.output_sinks  # noqa: F401
+    if trace:
+        from core.metrics import METRICS
+        METRICS.keep_events()
+
+def _rebuild_file(task):
+    """Worker entry point: decode one file and encode its codes for the sink, never raising."""
+    from core.pipeline import extract_symbols, numbered_output_path, verify_qr
+    from core.qr_generator import encode_qr
+    from core.output_sinks import encode_payload
+    from core.decode_cache import open_cache
+    from core.metrics import METRICS
+
+    number, input_path, name, options = task
+    options = dict(options)
+    profile = options.pop('profile', False)
+    if profile:
+        METRICS.enable()
+    cache_size = options.pop('cache_size', None)
+    if options.get('cache'):
+        # Workers get the cache path and open the file once per process
+        options['cache'] = open_cache(options['cache'], cache_size)
+    fmt = options.pop('format')
+    box_size = options.pop('box_size')
+    border = options.pop('border')
+    error_correction = options.pop('error_correction')
+    all_codes = options.pop('all_codes', False)
+    verify = options.pop('verify', 0)
+    start = time.perf_counter()
+    try:
+        symbols = extract_symbols(input_path, all_codes, **options)
+        # Payloads stay bytes: any encoding, or binary data, is rebuilt without a text round trip
+        data = [symbol.data for symbol in symbols]
+        matrices = [encode_qr(payload, error_correction) for payload in data]
+        payloads = [
+            (numbered_output_path(name, index, len(data)), encode_payload(fmt, matrix, box_size, border))
+            for index, matrix in enumerate(matrices)
+        ]
+        result = FileResult(input_path, data if all_codes else data[0], symbols[0].stage, payloads, None,
+                            time.perf_counter() - start)
+        if verify and number % verify == 0:
+            verify_start = time.perf_counter()
+            lossy = [symbol.stage for symbol in symbols if not symbol.raw]
+            verified = not lossy and all(verify_qr(matrix, symbol.data) for matrix, symbol in zip(matrices, symbols))
+            result = result._replace(verified=verified, verify_seconds=time.perf_counter() - verify_start)
+            if lossy:
+                result = result._replace(payloads=[], error=f"Round-trip verification impossible: the payload was "
+                                                            f"decoded as text ({lossy[0]}), its exact bytes are unknown")
+            elif not verified:
+                # Never store a code that doesn't read back as the original payload
+                result = result._replace(payloads=[], error="Round-trip verification failed: the rebuilt "
+                                                            "code does not decode to the extracted data")
+    except Exception as e:
+        result = FileResult(input_path, None, None, [], str(e) or type(e).__name__,
+                            time.perf_counter() - start)
+    if profile:
+        # Hand this file's timings to the parent, which merges them into its own registry
+        METRICS.observe('batch.file', result.seconds)
+        result = result._replace(metrics=METRICS.drain())
+    return result
+
+def _rebuild_chunk(tasks):
+    return [_rebuild_file(task) for task in tasks]
+
+def bounded_map(executor, chunk_fn, tasks, chunksize, window):
+    """Ordered, chunked map over the pool that keeps at most window chunks in flight.
+
+    chunk_fn receives a list of tasks and returns a list of results.
+    """
+    tasks = iter(tasks)
+    pending = deque()
+
+    def submit():
+        chunk = list(islice(tasks, chunksize))
+        if chunk:
+            pending.append(executor.submit(chunk_fn, chunk))
+
+    for _ in range(window):
+        submit()
+    while pending:
+        results = pending.popleft().result()
+        submit()
+        yield from results
+
+def run_batch(pairs, sink, options, jobs=None):
+    """Rebuild every input into an output sink using a pool of worker processes.
+
+    Workers decode and serialize; only this process writes to the sink, so archives and PDFs
+    are produced in one pass with bounded memory. options holds the rebuild settings
+    (box_size, border, error_correction and extract_all_qr options) plus all_codes, the
+    optional decode cache path and size in bytes (cache, cache_size), profile, which makes
+    workers collect stage metrics into this process's core.metrics registry, trace, which also
+    forwards their span events to its sinks, and verify: re-decode the rebuilt codes of every
+    Nth file (0 = off) and fail those that don't match.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    options = dict(options, format=sink.fmt)
+    # Run in this process, spans reach the sinks directly
+    trace = options.pop('trace', False)
+    tasks = ((number, path, os.path.splitext(name)[0], options) for number, (path, name) in enumerate(pairs))
+    jobs = jobs or os.cpu_count() or 1
+    chunksize = max(1, min(64, len(pairs) // (jobs * WINDOW_PER_JOB)))
+
+    start = time.perf_counter()
+    if jobs == 1:
+        _init_worker()
+        summary = _report(map(_rebuild_file, tasks), sink, len(pairs), start)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                                 initargs=(trace,)) as executor:
+            results = bounded_map(executor, _rebuild_chunk, tasks, chunksize, jobs * WINDOW_PER_JOB)
+            summary = _report(results, sink, len(pairs), start)
+    return summary
+
+def _report(results, sink, total, start):
+    """Store each finished file in the sink, print its outcome and then the batch totals."""
+    from core.metrics import METRICS
+
+    succeeded = failed = 0
+    stages = Counter()
+    verified = mismatches = 0
+    verify_seconds = verified_work_seconds = 0.0
+    for result in results:
+        if result.metrics:
+            METRICS.merge(result.metrics)
+        if result.verified is not None:
+            verified += 1
+            mismatches += not result.verified
+            verify_seconds += result.verify_seconds
+            verified_work_seconds += result.seconds
+        if result.error is None:
+            try:
+                with METRICS.span('sink.write'):
+                    outputs = [sink.add(name, payload) for name, payload in result.payloads]
+            except OSError as e:
+                result = result._replace(error=f"Could not write output: {e}")
+
+        if result.error is None:
+            succeeded += 1
+            stages[result.stage] += 1
+            codes = f"{len(result.data)} codes, " if isinstance(result.data, list) else ""
+            check = f", verified in {result.verify_seconds * 1000:.0f} ms" if result.verified else ""
+            print(f"✅ {result.input_path} -> {', '.join(outputs)} "
+                  f"({codes}{result.stage}, {result.seconds * 1000:.0f} ms{check})")
+        else:
+            failed += 1
+            print(f"❌ {result.input_path}: {result.error}")
+
+    elapsed = time.perf_counter() - start
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"\n📊 Processed {total} files: {succeeded} succeeded, {failed} failed "
+          f"in {elapsed:.2f} s ({rate:.1f} files/s)")
+    if stages:
+        print("🔎 Decoded by stage: " + ", ".join(f"{stage} {count}" for stage, count in stages.most_common()))
+    if verified:
+        share = verify_seconds / verified_work_seconds if verified_work_seconds else 0.0
+        print(f"🔁 Round trip verified for {verified} files: {mismatches} mismatches, "
+              f"{verify_seconds * 1000 / verified:.1f} ms per file ({share:.0%} on top of decode + encode)")
+    return succeeded, failed
@@ -0,0 +1,161 @@
+import csv
+import io
+import json
+import os
+import sys
+import time
+from collections import namedtuple
+from cli.batch import bounded_map, WINDOW_PER_JOB
+
+# Outcome of one input row; payload is the encoded code for the sink and verify_seconds the
+# time of its round-trip check (None when the row wasn't sampled)
+GeneratedCode = namedtuple('GeneratedCode', 'index name payload error verify_seconds', defaults=(None,))
+
+DEFAULT_NAME_TEMPLATE = '{index:05d}'
+
+# Rows sent to a worker at a time; one code takes a few milliseconds to encode and serialize
+CHUNK_SIZE = 32
+
+def input_format_for(path):
+    """Guess the row format from the file extension (CSV unless it looks like JSON lines)."""
+    return 'jsonl' if path.lower().endswith(('.jsonl', '.ndjson', '.json')) else 'csv'
+
+def read_rows(path, input_format=None, field='data'):
+    """Yield one dict per CSV row (header required) or JSON line; '-' reads stdin.
+
+    A JSON line holding a plain value instead of an object becomes {field: value}. A line that
+    isn't valid JSON is yielded as a ValueError, so it fails as its own row and the rest of the
+    file is still generated.
+    """
+    input_format = input_format or input_format_for(path)
+    if path == '-':
+        f = io.TextIOWrapper(sys.stdin.buffer, encoding='utf-8-sig', newline='')
+    else:
+        f = open(path, encoding='utf-8-sig', newline='')
+    with f:
+        if input_format == 'csv':
+            yield from csv.DictReader(f)
+            return
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            try:
+                row = json.loads(line)
+            except json.JSONDecodeError as e:
+                yield ValueError(f"Line {number}: invalid JSON ({e})")
+                continue
+            yield row if isinstance(row, dict) else {field: row}
+
+def minimal_version(rows, field='data', error_correction='H'):
+    """Smallest QR version that holds every row's field, so a whole batch shares one size.
+
+    Invalid rows, rows without the field and rows too long for any version are skipped; they
+    fail when generated.
+    """
+    from core.qr_generator import data_version
+
+    version = 1
+    for row in rows:
+        if isinstance(row, Exception) or row.get(field) is None:
+            continue
+        try:
+            version = max(version, data_version(str(row[field]), error_correction))
+        except ValueError:
+            pass
+    return version
+
+def _generate_code(task):
+    """Worker entry point: encode one row for the sink, never raising."""
+    from core.qr_generator import encode_qr
+    from core.output_sinks import encode_payload
+
+    index, row, options = task
+    if isinstance(row, Exception):
+        # An input line read_rows couldn't parse
+        return GeneratedCode(index, None, None, str(row))
+    try:
+        if row.get(options['field']) is None:
+            raise ValueError(f"Missing field '{options['field']}'")
+        name = options['template'].format_map({'index': index, **row})
+        data = str(row[options['field']])
+        matrix = encode_qr(data, options['error_correction'], options['version'])
+        payload = encode_payload(options['format'], matrix, options['box_size'], options['border'])
+        verify = options.get('verify')
+        if verify and index % verify == 0:
+            # Imports the decoder stack, so only when verification is on
+            from core.pipeline import verify_qr
+            start = time.perf_counter()
+            verified = verify_qr(matrix, data.encode('utf-8'))
+            seconds = time.perf_counter() - start
+            if not verified:
+                return GeneratedCode(index, name, None, "Round-trip verification failed: the code does not "
+                                                        "decode to the row's data", seconds)
+            return GeneratedCode(index, name, payload, None, seconds)
+        return GeneratedCode(index, name, payload, None)
+    except KeyError as e:
+        return GeneratedCode(index, None, None, f"Name template uses unknown field {e}")
+    except Exception as e:
+        return GeneratedCode(index, None, None, str(e) or type(e).__name__)
+
+def _generate_chunk(tasks):
+    return [_generate_code(task) for task in tasks]
+
+def run_generate(rows, sink, options, jobs=None):
+    """Generate one code per row into an output sink using a pool of worker processes.
+
+    options holds field (the column or key with the payload), template (output name format,
+    with {index} the 1-based row number and every row field available), version (None to fit
+    each code, or a pinned 1-40), box_size, border, error_correction and verify (re-decode every
+    Nth code, 0 = off). Rows are streamed, so the input may be larger than memory. Returns
+    (succeeded, failed).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+
+    options = dict(options, format=sink.fmt)
+    tasks = ((index, row, options) for index, row in enumerate(rows, 1))
+    jobs = jobs or os.cpu_count() or 1
+
+    start = time.perf_counter()
+    if jobs == 1:
+        summary = _report(map(_generate_code, tasks), sink, start)
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = bounded_map(executor, _generate_chunk, tasks, CHUNK_SIZE, jobs * WINDOW_PER_JOB)
+            summary = _report(results, sink, start)
+    return summary
+
+def _report(results, sink, start):
+    """Store each generated code in the sink, print failures and then the totals."""
+    succeeded = failed = 0
+    verified = mismatches = 0
+    verify_seconds = 0.0
+    names = set()
+    for result in results:
+        if result.verify_seconds is not None:
+            verified += 1
+            mismatches += result.error is not None
+            verify_seconds += result.verify_seconds
+        error = result.error
+        if error is None and result.name in names:
+            error = f"Duplicate output name '{result.name}'"
+        if error is None:
+            try:
+                sink.add(result.name, result.payload)
+            except OSError as e:
+                error = f"Could not write output: {e}"
+        if error is None:
+            succeeded += 1
+            names.add(result.name)
+        else:
+            failed += 1
+            print(f"❌ Row {result.index}: {error}")
+
+    elapsed = time.perf_counter() - start
+    total = succeeded + failed
+    rate = total / elapsed if elapsed > 0 else 0.0
+    print(f"\n📊 Generated {succeeded} of {total} codes ({failed} failed) "
+          f"in {elapsed:.2f} s ({rate:.1f} codes/s)")
+    if verified:
+        print(f"🔁 Round trip verified for {verified} codes: {mismatches} mismatches, "
+              f"{verify_seconds * 1000 / verified:.1f} ms per code")
+    return succeeded, failed
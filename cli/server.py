@@ -0,0 +1,242 @@
+"""Local HTTP decode service backed by a pool of pre-warmed worker processes.
+
+Endpoints:
+    GET  /health    worker count and requests in flight
+    POST /extract   image bytes in, JSON list of decoded codes out
+                    (query: all=1, pyramid=1, max_side=N, preprocess=raw,clahe,...)
+    POST /rebuild   image bytes in, clean QR code out
+                    (query: box_size 1-100, border 0-100, error_correction, format=png|jpg|bmp|svg|eps|pdf)
+    POST /analyze   text in (encoding detected, see core.payload), JSON content analysis out
+
+Example with the standard library client:
+
+    import urllib.request
+    with open('photo.jpg', 'rb') as f:
+        request = urllib.request.Request('http://127.0.0.1:8080/rebuild?box_size=8', data=f.read())
+    with urllib.request.urlopen(request) as response:
+        open('clean.png', 'wb').write(response.read())
+"""
+import base64
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+CONTENT_TYPES = {
+    'png': 'image/png',
+    'jpg': 'image/jpeg',
+    'bmp': 'image/bmp',
+    'svg': 'image/svg+xml',
+    'eps': 'application/postscript',
+    'pdf': 'application/pdf'
+}
+
+# Accepted ranges of the integer query parameters; larger values would make a worker allocate
+# huge rasters
+PARAM_RANGES = {
+    'box_size': (1, 100),
+    'border': (0, 100),
+    'max_side': (1, 65536)
+}
+
+def _int_param(query, name, default=None):
+    """Integer query parameter, checked against PARAM_RANGES; ValueError (422) otherwise."""
+    value = query.get(name)
+    if value is None:
+        return default
+    low, high = PARAM_RANGES[name]
+    try:
+        number = int(value)
+    except ValueError:
+        number = None
+    if number is None or not low <= number <= high:
+        raise ValueError(f"Invalid {name}: expected an integer from {low} to {high}, got {value!r}")
+    return number
+
+def _warm_worker():
+    """Import the decode/encode/analysis stack and run each stage once per worker."""
+    from core.qr_generator import encode_qr, render_qr
+    from core.qr_extractor import extract_all_qr
+    from core.content_analyzer import ContentAnalyzer
+
+    extract_all_qr(render_qr(encode_qr('warmup'), 4, 4, output='array'), cascade=('raw',))
+    ContentAnalyzer.analyze('warmup')
+
+def _ping():
+    return os.getpid()
+
+def _extract_options(query):
+    from core.qr_extractor import parse_cascade
+
+    options = {'pyramid': query.get('pyramid') == '1'}
+    if query.get('max_side'):
+        options['max_side'] = _int_param(query, 'max_side')
+    if query.get('preprocess'):
+        options['cascade'] = parse_cascade(query['preprocess'])
+    return options
+
+def _extract_job(body, query):
+    from core.pipeline import extract_symbols
+    from core.payload import detect_encoding, payload_text
+
+    symbols = extract_symbols(body, query.get('all') == '1', **_extract_options(query))
+    return [
+        {
+            'data': payload_text(symbol.data),
+            'encoding': detect_encoding(symbol.data),
+            'data_base64': base64.b64encode(symbol.data).decode('ascii'),
+            'raw': symbol.raw,
+            'type': symbol.type,
+            'polygon': symbol.polygon,
+            'rect': symbol.rect,
+            'orientation': symbol.orientation,
+            'stage': symbol.stage
+        }
+        for symbol in symbols
+    ]
+
+def _rebuild_job(body, query):
+    from core.pipeline import extract_symbols
+    from core.qr_generator import encode_qr
+    from core.output_sinks import encode_document
+
+    fmt = query.get('format', 'png')
+    if fmt not in CONTENT_TYPES:
+        raise ValueError(f"Unknown output format: {fmt}")
+    box_size = _int_param(query, 'box_size', 10)
+    border = _int_param(query, 'border', 4)
+    symbol = extract_symbols(body, **_extract_options(query))[0]
+    matrix = encode_qr(symbol.data, query.get('error_correction', 'H'))
+    return encode_document(fmt, matrix, box_size, border)
+
+def _analyze_job(body, query):
+    from core.content_analyzer import ContentAnalyzer
+    from core.payload import payload_text
+
+    return ContentAnalyzer.analyze(payload_text(body)).to_dict()
+
+# Endpoint -> worker job
+JOBS = {
+    '/extract': _extract_job,
+    '/rebuild': _rebuild_job,
+    '/analyze': _analyze_job
+}
+
+class QRServer(ThreadingHTTPServer):
+    """HTTP server that dispatches requests to a warm process pool with bounded admission."""
+    daemon_threads = True
+
+    def __init__(self, address, workers=None, max_pending=None, max_body=50 * 1024 * 1024, timeout=60):
+        super().__init__(address, QRRequestHandler)
+        self.workers = workers or os.cpu_count() or 1
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, initializer=_warm_worker)
+        self.max_pending = max_pending or self.workers * 2
+        self.slots = threading.BoundedSemaphore(self.max_pending)
+        self.max_body = max_body
+        self.timeout = timeout
+        self.in_flight = 0
+        self._lock = threading.Lock()
+        # Start (and so warm) every worker before the first request arrives
+        for future in [self.pool.submit(_ping) for _ in range(self.workers)]:
+            future.result()
+
+    def _release(self, _future=None):
+        with self._lock:
+            self.in_flight -= 1
+        self.slots.release()
+
+    def run_job(self, job, body, query):
+        """Run a job in the pool; returns None when every slot is taken (backpressure).
+
+        A slot stays taken until the job finishes, even if the request timed out.
+        """
+        if not self.slots.acquire(blocking=False):
+            return None
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self.pool.submit(job, body, query)
+        except Exception:
+            self._release()
+            raise
+        future.add_done_callback(self._release)
+        return future.result(self.timeout)
+
+    def server_close(self):
+        super().server_close()
+        self.pool.shutdown(cancel_futures=True)
+
+class QRRequestHandler(BaseHTTPRequestHandler):
+    server_version = "QRebuild"
+
+    def _send(self, status, body, content_type='application/json', headers=None):
+        if content_type == 'application/json':
+            body = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if urlparse(self.path).path != '/health':
+            return self._send(404, {'error': 'Not found'})
+        self._send(200, {
+            'status': 'ok',
+            'workers': self.server.workers,
+            'in_flight': self.server.in_flight,
+            'max_pending': self.server.max_pending
+        })
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        job = JOBS.get(url.path)
+        if job is None:
+            return self._send(404, {'error': 'Not found'})
+
+        header = self.headers.get('Content-Length')
+        if header is None:
+            return self._send(411, {'error': 'Content-Length required'})
+        try:
+            length = int(header)
+        except ValueError:
+            length = -1
+        if length < 0:
+            return self._send(400, {'error': f'Invalid Content-Length: {header!r}'})
+        if length == 0:
+            return self._send(400, {'error': 'Empty request body'})
+        if length > self.server.max_body:
+            return self._send(413, {'error': f'Request body larger than {self.server.max_body} bytes'})
+        body = self.rfile.read(length)
+        query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+
+        try:
+            result = self.server.run_job(job, body, query)
+        except FutureTimeoutError:
+            return self._send(504, {'error': 'Processing timed out'})
+        except (ValueError, UnicodeDecodeError) as e:
+            return self._send(422, {'error': str(e)})
+        except Exception as e:
+            return self._send(500, {'error': str(e) or type(e).__name__})
+
+        if result is None:
+            return self._send(503, {'error': 'Server busy, retry later'}, headers={'Retry-After': '1'})
+        if job is _rebuild_job:
+            return self._send(200, result, CONTENT_TYPES[query.get('format', 'png')])
+        self._send(200, {'codes': result} if job is _extract_job else result)
+
+def serve(host='127.0.0.1', port=8080, workers=None, max_pending=None, max_body=50 * 1024 * 1024, timeout=60):
+    """Run the decode service until interrupted."""
+    server = QRServer((host, port), workers, max_pending, max_body, timeout)
+    print(f"🚀 Serving on http://{host}:{server.server_address[1]} with {server.workers} warm workers "
+          f"(max {server.max_pending} requests in flight)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
@@ -1,31 +1,256 @@
-from core.qr_generator import generate_qr
-from core.qr_extractor import extract_qr
-from core.utils import display_image
-from cli.argparser import setup_argparser
+import json
+import os
+import sys
+import time
+from multiprocessing import freeze_support
+from cli.argparser import setup_argparser, setup_analyze_argparser, setup_generate_argparser, verify_interval
+from cli.batch import is_batch_input, run_batch
+from core.inputs import collect_inputs
+from core.metrics import METRICS, JSONLinesSink, format_breakdown, prometheus_text
+
+# OpenCV, pyzbar, qrcode and PIL are imported inside the functions that need them, so --help
+# and the analyze subcommand start without loading (or, in the one-file build, unpacking) them
+
+def process_qr(input_path, output_path="clean_qr.png", box_size=10, border=4, error_correction='H', display=False,
+               all_codes=False, verify=False, **extract_options):
+    """Main processing pipeline. Returns True on success.
+
+    With verify, each rebuilt code is re-decoded from memory and must give back the extracted
+    payload byte for byte; saved codes that don't are deleted again.
+    """
+    from core.pipeline import rebuild_qr, rebuild_all_qr, verify_qr
+    from core.qr_generator import encode_qr
+    from core.payload import describe_payload
+    from core.utils import display_image
 
-def process_qr(input_path, output_path="clean_qr.png", box_size=10, border=4, error_correction='H', display=False):
-    """Main processing pipeline."""
     try:
-        # Extract data
-        qr_data = extract_qr(input_path)
-        print(f"🔍 Extracted QR Data: {qr_data}")
-        
-        # Generate clean QR
-        new_qr = generate_qr(qr_data, box_size, border, error_correction)
-        new_qr.save(output_path)
-        print(f"✅ Clean QR code saved to: {output_path}")
-        
-        # Display result if requested
-        if display:
-            display_image(output_path)
-        
+        # Extract data and generate clean QR codes
+        if all_codes:
+            saved = rebuild_all_qr(input_path, output_path, box_size, border, error_correction, **extract_options)
+        else:
+            symbol = rebuild_qr(input_path, output_path, box_size, border, error_correction, **extract_options)
+            saved = [(symbol, output_path)]
+
+        ok = True
+        for symbol, path in saved:
+            print(f"🔍 Extracted QR Data: {describe_payload(symbol.data)} (stage: {symbol.stage})")
+            print(f"✅ Clean QR code saved to: {path}")
+            if not symbol.raw:
+                print("⚠️ The payload was decoded as text, so non-ASCII bytes may differ from the original")
+
+            if verify:
+                error = None
+                if not symbol.raw:
+                    error = "impossible: the payload's exact bytes are unknown"
+                else:
+                    # encode_qr is cached, so this is the matrix that was just saved
+                    start = time.perf_counter()
+                    if verify_qr(encode_qr(symbol.data, error_correction), symbol.data):
+                        print(f"🔁 Round trip verified ({(time.perf_counter() - start) * 1000:.1f} ms)")
+                    else:
+                        error = "failed: the rebuilt code does not decode to the extracted data"
+                if error:
+                    # Like batch mode, never leave a code behind that didn't pass
+                    os.remove(path)
+                    print(f"❌ Round-trip verification {error}; removed {path}")
+                    ok = False
+                    continue
+
+            # Display result if requested
+            if display:
+                display_image(path)
+        return ok
+
     except Exception as e:
         print(f"❌ Error: {e}")
+        return False
+
+def process_video(source, stride=1, motion_threshold=2.0, dedup_window=5.0, **extract_options):
+    """Print QR sightings from a video or capture device as JSON lines. Returns True on success."""
+    from core.video_extractor import stream_qr_events
+    from core.payload import payload_text
+
+    events = 0
+    try:
+        for event in stream_qr_events(source, stride, motion_threshold, dedup_window, **extract_options):
+            events += 1
+            print(json.dumps({
+                'timestamp': round(event.timestamp, 3),
+                'frame': event.frame_index,
+                'data': payload_text(event.data),
+                'polygon': event.polygon
+            }), flush=True)
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        print(f"❌ Error: {e}", file=sys.stderr)
+        return False
+    print(f"📊 {events} QR events", file=sys.stderr)
+    return True
+
+def write_metrics(path, snapshot):
+    """Dump a metrics snapshot as Prometheus text (.prom / .txt) or JSON."""
+    with open(path, 'w', encoding='utf-8') as f:
+        if path.lower().endswith(('.prom', '.txt')):
+            f.write(prometheus_text(snapshot))
+        else:
+            json.dump(snapshot, f, indent=2)
+
+def analyze_main(argv):
+    """The analyze subcommand: classify payloads without touching the image stack."""
+    from core.content_analyzer import ContentAnalyzer
+
+    args = setup_analyze_argparser().parse_args(argv)
+    if args.content:
+        contents = args.content
+    elif args.lines:
+        contents = (line.rstrip('\r\n') for line in sys.stdin)
+    else:
+        contents = [sys.stdin.read()]
+
+    if args.format == 'csv':
+        for chunk in ContentAnalyzer.analyze_many(contents, output='csv'):
+            sys.stdout.write(chunk)
+        return 0
+
+    for index, analysis in enumerate(ContentAnalyzer.analyze_many(contents)):
+        if args.format == 'json':
+            print(json.dumps(analysis.to_dict(), ensure_ascii=False))
+        else:
+            if index:
+                print()
+            print(ContentAnalyzer.format_structured_content(analysis))
+    return 0
+
+def generate_main(argv):
+    """The generate subcommand: one code per CSV / JSONL row into an output sink."""
+    from cli.generate import read_rows, minimal_version, run_generate
+    from core.output_sinks import open_sink
+
+    parser = setup_generate_argparser()
+    args = parser.parse_args(argv)
+    input_format = args.input_format or ('csv' if args.input == '-' else None)
+    verify = verify_interval(parser, args)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    def rows():
+        return read_rows(args.input, input_format, args.field)
+
+    try:
+        version = args.qr_version
+        if version == 'auto':
+            if args.input == '-':
+                # stdin can't be read twice
+                cached = list(rows())
+                rows = lambda: cached  # noqa: E731
+            version = minimal_version(rows(), args.field, args.error_correction)
+            print(f"📐 Batch version: {version} ({17 + 4 * version}x{17 + 4 * version} modules)")
+        options = {
+            'field': args.field,
+            'template': args.name,
+            'version': version,
+            'box_size': args.box_size,
+            'border': args.border,
+            'error_correction': args.error_correction,
+            'verify': verify
+        }
+        with open_sink(args.output, args.format) as sink:
+            _, failed = run_generate(rows(), sink, options, args.jobs)
+    except (OSError, ValueError) as e:
+        print(f"❌ Error: {e}")
+        return 1
+    return 1 if failed else 0
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == 'analyze':
+        return analyze_main(argv[1:])
+    if argv and argv[0] == 'generate':
+        return generate_main(argv[1:])
 
-def main():
     parser = setup_argparser()
-    args = parser.parse_args()
-    process_qr(args.input, args.output, args.box_size, args.border, args.error_correction, args.display)
+    args = parser.parse_args(argv)
+    profile = args.profile or args.metrics_out is not None or args.trace is not None
+    if profile:
+        METRICS.enable()
+    trace = None
+    if args.trace:
+        try:
+            trace = JSONLinesSink(open(args.trace, 'w', encoding='utf-8'))
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        METRICS.add_sink(trace)
+    try:
+        return run(parser, args, profile)
+    finally:
+        if profile:
+            snapshot = METRICS.snapshot()
+            if args.profile:
+                print("\n⏱️ Stage breakdown:\n" + format_breakdown(snapshot), file=sys.stderr)
+            if args.metrics_out:
+                write_metrics(args.metrics_out, snapshot)
+            if trace:
+                trace.write_snapshot(snapshot)
+                trace.file.close()
+
+def run(parser, args, profile=False):
+    """Dispatch to video, batch or single-image mode; returns the exit code."""
+    verify = verify_interval(parser, args)
+    if args.jobs is not None and args.jobs < 1:
+        parser.error("--jobs must be at least 1")
+
+    from core.qr_extractor import parse_cascade
+
+    extract_options = {'pyramid': args.pyramid, 'max_side': args.max_side}
+    if args.preprocess:
+        try:
+            extract_options['cascade'] = parse_cascade(args.preprocess)
+        except ValueError as e:
+            parser.error(str(e))
+
+    if args.video is not None:
+        if args.stride < 1:
+            parser.error("--stride must be at least 1")
+        ok = process_video(args.video, args.stride, args.motion_threshold, args.dedup_window, **extract_options)
+        return 0 if ok else 1
+
+    if is_batch_input(args.input, args.input_list):
+        pairs = collect_inputs(args.input, args.input_list)
+        if not pairs:
+            print("❌ Error: No input images found")
+            return 1
+        options = {
+            'box_size': args.box_size,
+            'border': args.border,
+            'error_correction': args.error_correction,
+            'all_codes': args.all,
+            'cache': args.cache,
+            'cache_size': args.cache_size * 1024 * 1024,
+            'profile': profile,
+            'trace': args.trace is not None,
+            'verify': verify,
+            **extract_options
+        }
+        from core.output_sinks import open_sink
+        try:
+            sink = open_sink(args.output or "clean_qr_output", args.format)
+        except OSError as e:
+            print(f"❌ Error: {e}")
+            return 1
+        with sink:
+            _, failed = run_batch(pairs, sink, options, args.jobs)
+        return 1 if failed else 0
+
+    if args.cache:
+        from core.decode_cache import open_cache
+        extract_options['cache'] = open_cache(args.cache, args.cache_size * 1024 * 1024)
+    ok = process_qr(args.input[0], args.output or "clean_qr_output.png", args.box_size, args.border,
+                    args.error_correction, args.display, args.all, verify > 0, **extract_options)
+    return 0 if ok else 1
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    # Required for the process pool in PyInstaller one-file builds
+    freeze_support()
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""asyncio front end for the decode/encode pipeline.
+
+The blocking calls run in an executor so the event loop stays responsive: a private thread
+pool by default (OpenCV and zbar release the GIL while they work), or any executor you pass,
+e.g. a ProcessPoolExecutor when QR encoding (pure Python) dominates. A semaphore bounds the
+calls in flight, so thousands of waiting requests never queue thousands of jobs; cancelling
+a request that is still waiting for the semaphore costs nothing.
+
+    from core.async_pipeline import aextract_qr, extract_completed
+
+    text = await aextract_qr(upload_bytes)
+    async for image, result in extract_completed(paths):
+        ...
+"""
+import asyncio
+import functools
+import os
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from core.content_analyzer import ContentAnalyzer
+from core.pipeline import rebuild_qr
+from core.qr_extractor import extract_all_qr, extract_qr
+from core.qr_generator import generate_qr
+
+DEFAULT_CONCURRENCY = os.cpu_count() or 4
+
+class AsyncPipeline:
+    """Async extract/generate/rebuild with an executor and a bound on concurrent calls.
+
+    Cancelling an awaiting task frees its slot at once. A call that already started in a
+    thread runs to the end in the background and its result is dropped; process pool calls
+    that have not started yet are cancelled in the pool too.
+    """
+
+    def __init__(self, executor=None, max_concurrency=DEFAULT_CONCURRENCY):
+        self.max_concurrency = max_concurrency
+        self._executor = executor
+        self._owns_executor = executor is None
+        # One semaphore per event loop; asyncio primitives can't be shared across loops
+        self._semaphores = weakref.WeakKeyDictionary()
+
+    @property
+    def executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(self.max_concurrency, thread_name_prefix='qrebuild')
+        return self._executor
+
+    def _semaphore(self, loop):
+        semaphore = self._semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._semaphores[loop] = asyncio.Semaphore(self.max_concurrency)
+        return semaphore
+
+    async def run(self, fn, *args, **kwargs):
+        """Run a blocking fn(*args, **kwargs) in the executor once a concurrency slot is free."""
+        loop = asyncio.get_running_loop()
+        async with self._semaphore(loop):
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+
+    async def aextract_qr(self, image, **extract_options):
+        """Async extract_qr: the first code's text, ValueError when there is none."""
+        return await self.run(extract_qr, image, **extract_options)
+
+    async def aextract_all_qr(self, image, **extract_options):
+        """Async extract_all_qr: every decoded QRResult."""
+        return await self.run(extract_all_qr, image, **extract_options)
+
+    async def agenerate_qr(self, data, box_size=10, border=4, error_correction='H'):
+        """Async generate_qr: a clean PIL image of data."""
+        return await self.run(generate_qr, data, box_size, border, error_correction)
+
+    async def arebuild(self, input_path, output_path, box_size=10, border=4, error_correction='H',
+                       **extract_options):
+        """Async rebuild_qr: decode input_path, save a clean copy and return the QRResult."""
+        return await self.run(rebuild_qr, input_path, output_path, box_size, border, error_correction,
+                              **extract_options)
+
+    async def aanalyze(self, content):
+        """ContentAnalyzer.analyze; it takes microseconds, so it runs inline on the loop."""
+        return ContentAnalyzer.analyze(content)
+
+    async def completed(self, function, items, return_exceptions=True):
+        """Yield (item, result) for await function(item) over items, in completion order.
+
+        At most twice max_concurrency calls are scheduled at a time, so items may be a long or
+        endless iterator. Failures are yielded as the exception instance, or raised when
+        return_exceptions is False. Leaving the loop early cancels the calls still pending.
+        """
+        items = iter(items)
+        pending = {}
+        window = 2 * self.max_concurrency
+
+        def schedule():
+            for item in islice(items, window - len(pending)):
+                pending[asyncio.ensure_future(function(item))] = item
+
+        schedule()
+        try:
+            while pending:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    item = pending.pop(task)
+                    try:
+                        result = task.result()
+                    except Exception as e:
+                        if not return_exceptions:
+                            raise
+                        result = e
+                    yield item, result
+                schedule()
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def extract_completed(self, images, return_exceptions=True, **extract_options):
+        """completed() over aextract_all_qr: yields (image, [QRResult, ...]) as images finish."""
+        return self.completed(lambda image: self.aextract_all_qr(image, **extract_options), images,
+                              return_exceptions)
+
+    def shutdown(self, wait=True):
+        """Shut down the executor if this pipeline created it."""
+        if self._owns_executor and self._executor is not None:
+            self._executor.shutdown(wait=wait, cancel_futures=True)
+            self._executor = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.shutdown(wait=False)
+
+# Shared pipeline behind the module-level functions; replace it with configure()
+_default = AsyncPipeline()
+
+def configure(executor=None, max_concurrency=DEFAULT_CONCURRENCY):
+    """Set the executor and concurrency bound used by the module-level functions."""
+    global _default
+    _default.shutdown(wait=False)
+    _default = AsyncPipeline(executor, max_concurrency)
+    return _default
+
+async def aextract_qr(image, **extract_options):
+    return await _default.aextract_qr(image, **extract_options)
+
+async def aextract_all_qr(image, **extract_options):
+    return await _default.aextract_all_qr(image, **extract_options)
+
+async def agenerate_qr(data, box_size=10, border=4, error_correction='H'):
+    return await _default.agenerate_qr(data, box_size, border, error_correction)
+
+async def arebuild(input_path, output_path, box_size=10, border=4, error_correction='H', **extract_options):
+    return await _default.arebuild(input_path, output_path, box_size, border, error_correction,
+                                   **extract_options)
+
+async def aanalyze(content):
+    return await _default.aanalyze(content)
+
+def completed(function, items, return_exceptions=True):
+    return _default.completed(function, items, return_exceptions)
+
+def extract_completed(images, return_exceptions=True, **extract_options):
+    return _default.extract_completed(images, return_exceptions, **extract_options)
@@ -1,390 +1,277 @@
+import csv
+import io
 import json
+import re
+from itertools import islice
 from urllib.parse import urlparse
+from core.metrics import METRICS
+from core.content_types import (
+    RESULT_TYPES, Analysis, BitcoinAnalysis, EmailAnalysis, EmptyAnalysis, ErrorAnalysis, GeoAnalysis,
+    JSONAnalysis, PhoneAnalysis, SMSAnalysis, TextAnalysis, URLAnalysis, VCardAnalysis, WiFiAnalysis
+)
+
+# Precompiled matchers for payloads without a distinctive prefix
+_EMAIL_RE = re.compile(r'[^\n ]*@[^\n @]*\.[^\n @]*')
+_PHONE_RE = re.compile(r'[+ ]*\d[\d+ ]*')
+
+# First characters of JSON documents; JSON may also follow whitespace or a byte order mark
+_JSON_STARTS = ('{', '[')
+
+# Classifiers: content -> Analysis, or None when the content is not of their type
+
+def _analyze_url(content):
+    # urlparse only finds a netloc after '://', so skip the parse for everything else
+    if '://' not in content:
+        return None
+    parsed = urlparse(content)
+    if not (parsed.scheme and parsed.netloc):
+        return None
+    return URLAnalysis(content)
+
+def _analyze_wifi(content):
+    return WiFiAnalysis(content)
+
+def _analyze_vcard(content):
+    return VCardAnalysis(content)
+
+def _analyze_bitcoin(content):
+    return BitcoinAnalysis(content)
+
+def _analyze_json(content):
+    try:
+        return JSONAnalysis(content, json.loads(content.lstrip('\ufeff')))
+    except (ValueError, RecursionError):
+        return None
+
+def _analyze_mailto(content):
+    if '@' not in content or '\n' in content:
+        return None
+    return EmailAnalysis(content)
+
+def _analyze_email(content):
+    if not _EMAIL_RE.fullmatch(content):
+        return None
+    return EmailAnalysis(content)
+
+def _analyze_tel(content):
+    return PhoneAnalysis(content)
+
+def _analyze_phone(content):
+    if not _PHONE_RE.fullmatch(content) or len(content.replace(' ', '')) <= 6:
+        return None
+    return PhoneAnalysis(content)
+
+def _analyze_sms(content):
+    return SMSAnalysis(content)
+
+def _analyze_geo(content):
+    analysis = GeoAnalysis(content)
+    try:
+        analysis.data
+    except Exception as e:
+        return ErrorAnalysis(content, {'message': f"Invalid GEO format: {str(e)}"})
+    return analysis
+
+# Columns of the columnar output of ContentAnalyzer.analyze_many
+ANALYSIS_COLUMNS = ('index', 'type_code', 'type', 'length', 'key', 'detail')
+
+def _summary_value(data, field):
+    if field is None:
+        return ''
+    value = data.get(field)
+    return '' if value is None else str(value)
+
+def _numpy_chunk(offset, types, codes, lengths, keys, details):
+    import numpy as np
+
+    return np.rec.fromarrays(
+        [np.arange(offset, offset + len(codes), dtype=np.int64), np.array(codes, dtype=np.uint16),
+         np.array(types, dtype=object), np.array(lengths, dtype=np.int32),
+         np.array(keys, dtype=object), np.array(details, dtype=object)],
+        names=ANALYSIS_COLUMNS
+    )
+
+def _arrow_chunk(offset, types, codes, lengths, keys, details):
+    try:
+        import pyarrow as pa
+    except ImportError:
+        raise ImportError("Arrow output requires pyarrow (pip install pyarrow)") from None
+
+    return pa.record_batch(
+        [pa.array(range(offset, offset + len(codes)), pa.int64()), pa.array(codes, pa.uint16()),
+         pa.array(types, pa.string()).dictionary_encode(), pa.array(lengths, pa.int32()),
+         pa.array(keys, pa.string()), pa.array(details, pa.string())],
+        names=list(ANALYSIS_COLUMNS)
+    )
+
+def _csv_chunk(offset, types, codes, lengths, keys, details, first):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator='\n')
+    if first:
+        writer.writerow(ANALYSIS_COLUMNS)
+    writer.writerows(zip(range(offset, offset + len(codes)), codes, types, lengths, keys, details))
+    return buffer.getvalue()
+
+# Columnar output -> chunk builder(offset, types, codes, lengths, keys, details); the CSV builder
+# also takes whether to write the header
+COLUMNAR_OUTPUTS = {
+    'numpy': _numpy_chunk,
+    'arrow': _arrow_chunk,
+    'csv': _csv_chunk
+}
+
+# Per-payload outputs of ContentAnalyzer.analyze_many
+RECORD_OUTPUTS = ('analyses', 'dicts')
 
 class ContentAnalyzer:
-    @staticmethod
-    def analyze(content):
-        """Analyze QR code content and return structured information."""
+    # Payload type names in type-code order; types of registered handlers are appended on first use
+    type_names = ['Empty', 'Error', 'Text', 'URL', 'Email', 'Phone', 'SMS', 'WiFi Configuration', 'vCard',
+                  'Bitcoin Payment', 'Geographic Location', 'JSON']
+    _type_codes = {name: code for code, name in enumerate(type_names)}
+    # First character (lowercase) -> [(lowercase prefix, handler)], most recently registered first
+    _prefix_handlers = {}
+    # Handlers tried in order when no prefix handler claims the content
+    _fallback_handlers = []
+
+    @classmethod
+    def register(cls, handler, prefixes=()):
+        """Register a payload type.
+
+        handler(content) returns an Analysis (see core.content_types), or None to let other
+        handlers try. With prefixes it only runs for content starting with one of them
+        (case-insensitive); otherwise it joins the fallback chain ahead of the plain-text default.
+        """
+        if not prefixes:
+            cls._fallback_handlers.append(handler)
+        for prefix in prefixes:
+            prefix = prefix.lower()
+            cls._prefix_handlers.setdefault(prefix[0], []).insert(0, (prefix, handler))
+
+    @classmethod
+    def analyze(cls, content):
+        """Classify QR code content; the returned Analysis parses its fields on first access."""
+        if not METRICS.enabled:
+            # Hot path: skip even the no-op context manager
+            return cls._classify(content)
+        with METRICS.span('analyze'):
+            return cls._classify(content)
+
+    @classmethod
+    def _classify(cls, content):
         try:
-            # 1. Check for empty content
             if not content.strip():
-                return {
-                    'type': 'Empty',
-                    'data': {'message': 'No content detected'}
-                }
-
-            # 2. Check for URL
-            parsed = urlparse(content)
-            if parsed.scheme and parsed.netloc:
-                return {
-                    'type': 'URL',
-                    'data': {
-                        'scheme': parsed.scheme,
-                        'domain': parsed.netloc,
-                        'path': parsed.path or '/',
-                        'query': parsed.query,
-                        'fragment': parsed.fragment
-                    }
-                }
-
-            # 3. Check for WiFi network configuration
-            if content.startswith('WIFI:'):
-                params = {}
-                for part in content[5:].split(';'):
-                    if ':' in part:
-                        key, val = part.split(':', 1)
-                        params[key] = val
-                return {
-                    'type': 'WiFi Configuration',
-                    'data': {
-                        'ssid': params.get('S', ''),
-                        'password': bool(params.get('P')),
-                        'encryption': params.get('T', 'Unknown'),
-                        'hidden': params.get('H') == 'true'
-                    }
-                }
-
-            # 4. Check for vCard
-            if content.startswith('BEGIN:VCARD'):
-                result = {'type': 'vCard', 'data': {}}
-                lines = content.split('\n')
-                for line in lines:
-                    if line.startswith('VERSION:'):
-                        result['data']['version'] = line.split(':', 1)[1]
-                    elif line.startswith('N:'):
-                        name_parts = line.split(':', 1)[1].split(';')
-                        result['data']['name_structured'] = {
-                            'last': name_parts[0] if len(name_parts) > 0 else '',
-                            'first': name_parts[1] if len(name_parts) > 1 else '',
-                            'middle': name_parts[2] if len(name_parts) > 2 else '',
-                            'prefix': name_parts[3] if len(name_parts) > 3 else '',
-                            'suffix': name_parts[4] if len(name_parts) > 4 else ''
-                        }
-                    elif line.startswith('FN:'):
-                        result['data']['name'] = line.split(':', 1)[1]
-                    elif line.startswith('TITLE:'):
-                        result['data']['title'] = line.split(':', 1)[1]
-                    elif line.startswith('TEL:') or line.startswith('TEL;'):
-                        # Handle phone with parameters like TEL;WORK;VOICE:
-                        parts = line.split(':', 1)
-                        if len(parts) > 1:
-                            phone_value = parts[1]
-                            phone_type = parts[0].split(';')[1:] if ';' in parts[0] else ['DEFAULT']
-                            result['data']['phone'] = phone_value
-                            result['data']['phone_type'] = ';'.join(phone_type)
-                    elif line.startswith('EMAIL:') or line.startswith('EMAIL;'):
-                        # Handle email with parameters like EMAIL;WORK;INTERNET:
-                        parts = line.split(':', 1)
-                        if len(parts) > 1:
-                            email_value = parts[1]
-                            email_type = parts[0].split(';')[1:] if ';' in parts[0] else ['DEFAULT']
-                            result['data']['email'] = email_value
-                            result['data']['email_type'] = ';'.join(email_type)
-                    elif line.startswith('ORG:'):
-                        result['data']['organization'] = line.split(':', 1)[1]
-                    elif line.startswith('ADR:') or line.startswith('ADR;'):
-                        # Handle address with parameters
-                        parts = line.split(':', 1)
-                        if len(parts) > 1:
-                            addr_parts = parts[1].split(';')
-                            addr_type = parts[0].split(';')[1:] if ';' in parts[0] else ['DEFAULT']
-                            result['data']['address'] = {
-                                'po_box': addr_parts[0] if len(addr_parts) > 0 else '',
-                                'extended': addr_parts[1] if len(addr_parts) > 1 else '',
-                                'street': addr_parts[2] if len(addr_parts) > 2 else '',
-                                'city': addr_parts[3] if len(addr_parts) > 3 else '',
-                                'region': addr_parts[4] if len(addr_parts) > 4 else '',
-                                'postal': addr_parts[5] if len(addr_parts) > 5 else '',
-                                'country': addr_parts[6] if len(addr_parts) > 6 else '',
-                                'type': ';'.join(addr_type)
-                            }
-                    elif line.startswith('URL:'):
-                        result['data']['url'] = line.split(':', 1)[1]
-                    elif line.startswith('NOTE:'):
-                        result['data']['note'] = line.split(':', 1)[1]
-                return result
-
-            # 5. Check for Bitcoin address
-            if content.lower().startswith('bitcoin:'):
-                addr = content[8:].split('?')[0]
-                result = {
-                    'type': 'Bitcoin Payment',
-                    'data': {
-                        'address': addr
-                    }
-                }
-                if '?' in content:
-                    params = content.split('?')[1]
-                    for param in params.split('&'):
-                        if '=' in param:
-                            key, val = param.split('=', 1)
-                            result['data'][key.lower()] = val
-                return result
-
-            # 6. Check for JSON
-            try:
-                json_data = json.loads(content)
-                return {
-                    'type': 'JSON',
-                    'data': json_data
-                }
-            except:
-                pass
-
-            # 7. Check for email
-            if '@' in content and '\n' not in content:
-                if content.lower().startswith('mailto:'):
-                    try:
-                        # Format: mailto:address?param1=value1&param2=value2
-                        parts = content[7:].split('?', 1)  # Split at first ?
-                        address = parts[0]
-                        params = {}
-                        
-                        if len(parts) > 1:
-                            for param in parts[1].split('&'):
-                                if '=' in param:
-                                    key, val = param.split('=', 1)
-                                    params[key.lower()] = val
-                        
-                        return {
-                            'type': 'Email',
-                            'data': {
-                                'address': address,
-                                'parameters': params
-                            }
-                        }
-                    except Exception as e:
-                        return {
-                            'type': 'Error',
-                            'data': {
-                                'message': f"Invalid mailto format: {str(e)}"
-                            }
-                        }
-                elif ' ' not in content and '.' in content.split('@')[-1]:
-                    return {
-                        'type': 'Email',
-                        'data': {
-                            'address': content,
-                            'parameters': {}
-                        }
-                    }
-
-            # 8. Check for phone number
-            if (content.replace('+', '').replace(' ', '').isdigit() and 
-                len(content.replace(' ', '')) > 6):
-                if content.startswith('tel:'):
-                    return {
-                        'type': 'Phone',
-                        'data': {
-                            'number': content[4:]
-                        }
-                    }
-                else:
-                    return {
-                        'type': 'Phone',
-                        'data': {
-                            'number': content
-                        }
-                    }
-
-            # 9. Check for SMS
-            if content.lower().startswith('smsto:'):
-                parts = content[6:].split(':')
-                result = {
-                    'type': 'SMS',
-                    'data': {
-                        'number': parts[0]
-                    }
-                }
-                if len(parts) > 1:
-                    result['data']['message'] = parts[1]
-                return result
-            
-            # 2. Check for GEO location
-            if content.lower().startswith('geo:'):
-                try:
-                    # Format: geo:lat,lng[,alt][;param=value]
-                    parts = content[4:].split(';')
-                    coordinates = parts[0].split(',')
-                    
-                    data = {
-                        'latitude': float(coordinates[0]),
-                        'longitude': float(coordinates[1]),
-                        'altitude': float(coordinates[2]) if len(coordinates) > 2 else None
-                    }
-                    
-                    # Parse parameters if any
-                    if len(parts) > 1:
-                        params = {}
-                        for param in parts[1:]:
-                            if '=' in param:
-                                key, val = param.split('=', 1)
-                                params[key.lower()] = val
-                        data['parameters'] = params
-                    
-                    return {
-                        'type': 'Geographic Location',
-                        'data': data
-                    }
-                except Exception as e:
-                    return {
-                        'type': 'Error',
-                        'data': {
-                            'message': f"Invalid GEO format: {str(e)}"
-                        }
-                    }
-
-            # 10. Default to plain text
-            return {
-                'type': 'Text',
-                'data': {
-                    'length': len(content),
-                    'preview': content[:100] + ('...' if len(content) > 100 else '')
-                }
-            }
+                return EmptyAnalysis(content)
+
+            if content[0].isspace() or content[0] == '\ufeff':
+                # Prefixes are matched at the very start, but JSON may be indented
+                if content.lstrip().lstrip('\ufeff').lstrip()[:1] in _JSON_STARTS:
+                    result = _analyze_json(content)
+                    if result is not None:
+                        return result
+
+            for prefix, handler in cls._prefix_handlers.get(content[0].lower(), ()):
+                if content[:len(prefix)].lower() == prefix:
+                    if prefix.endswith(':') and content.startswith('//', len(prefix)):
+                        # scheme://host is a URL whatever the scheme (geo://1,2, mailto://a@b.c)
+                        result = _analyze_url(content)
+                        if result is not None:
+                            return result
+                    result = handler(content)
+                    if result is not None:
+                        return result
+
+            for handler in cls._fallback_handlers:
+                result = handler(content)
+                if result is not None:
+                    return result
+
+            return TextAnalysis(content)
 
         except Exception as e:
-            return {
-                'type': 'Error',
-                'data': {
-                    'message': str(e)
-                }
-            }
+            return ErrorAnalysis(content, {'message': str(e)})
+
+    @classmethod
+    def type_code(cls, type_name):
+        """Small stable integer for a payload type name (see type_names)."""
+        code = cls._type_codes.get(type_name)
+        if code is None:
+            code = cls._type_codes[type_name] = len(cls.type_names)
+            cls.type_names.append(type_name)
+        return code
+
+    @classmethod
+    def analyze_many(cls, contents, chunk_size=4096, output='analyses'):
+        """Analyze an iterable of payloads lazily, chunk_size payloads at a time.
+
+        With output='analyses' one Analysis (a lazily parsed mapping, see core.content_types) is
+        yielded per payload, with 'dicts' its plain to_dict() form. With 'numpy', 'arrow' or
+        'csv' one chunk is yielded per chunk_size payloads instead: a NumPy record array, a
+        pyarrow RecordBatch or CSV text (header in the first chunk) with the ANALYSIS_COLUMNS
+        columns, where key and detail hold the summary fields of each result type. Repeated payloads
+        within a chunk are analyzed once and share their result.
+        """
+        if output not in RECORD_OUTPUTS and output not in COLUMNAR_OUTPUTS:
+            available = ', '.join(RECORD_OUTPUTS + tuple(COLUMNAR_OUTPUTS))
+            raise ValueError(f"Unknown output: {output}. Available: {available}")
+        contents = iter(contents)
+        offset = 0
+        while True:
+            chunk = list(islice(contents, chunk_size))
+            if not chunk:
+                return
+            if output in RECORD_OUTPUTS:
+                seen = {}
+                for content in chunk:
+                    analysis = seen.get(content)
+                    if analysis is None:
+                        analysis = cls.analyze(content)
+                        if output == 'dicts':
+                            analysis = analysis.to_dict()
+                        seen[content] = analysis
+                    yield analysis
+            elif output == 'csv':
+                yield _csv_chunk(offset, *cls._summarize_chunk(chunk), offset == 0)
+            else:
+                yield COLUMNAR_OUTPUTS[output](offset, *cls._summarize_chunk(chunk))
+            offset += len(chunk)
+
+    @classmethod
+    def _summarize_chunk(cls, chunk):
+        """Column lists (types, codes, lengths, keys, details) for a chunk of payloads."""
+        seen = {}
+        rows = []
+        for content in chunk:
+            row = seen.get(content)
+            if row is None:
+                analysis = cls.analyze(content)
+                key_field, detail_field = analysis.summary
+                data = analysis.data
+                row = seen[content] = (
+                    analysis.type, cls.type_code(analysis.type), len(content),
+                    _summary_value(data, key_field), _summary_value(data, detail_field)
+                )
+            rows.append(row)
+        return tuple(map(list, zip(*rows)))
 
     @staticmethod
     def format_structured_content(analysis):
         """Format the analysis result into human-readable text."""
-        if analysis['type'] == 'Error':
-            return f"Error analyzing content: {analysis['data']['message']}"
-
-        lines = [f"Type: {analysis['type']}"]
-        
-        if analysis['type'] == 'URL':
-            url_data = analysis['data']
-            lines.append(f"Scheme: {url_data['scheme']}")
-            lines.append(f"Domain: {url_data['domain']}")
-            lines.append(f"Path: {url_data['path']}")
-            if url_data['query']:
-                lines.append(f"Query: {url_data['query']}")
-            if url_data['fragment']:
-                lines.append(f"Fragment: {url_data['fragment']}")
-
-        elif analysis['type'] == 'WiFi Configuration':
-            wifi_data = analysis['data']
-            lines.append(f"SSID: {wifi_data['ssid']}")
-            lines.append("Password: " + ("*****" if wifi_data['password'] else "(none)"))
-            lines.append(f"Encryption: {wifi_data['encryption']}")
-            lines.append(f"Hidden: {'Yes' if wifi_data['hidden'] else 'No'}")
-
-        elif analysis['type'] == 'vCard':
-            vcard_data = analysis['data']
-            if 'version' in vcard_data:
-                lines.append(f"Version: {vcard_data['version']}")
-            if 'name' in vcard_data:
-                lines.append(f"Full Name: {vcard_data['name']}")
-            if 'name_structured' in vcard_data:
-                ns = vcard_data['name_structured']
-                name_parts = []
-                if ns['prefix']: 
-                    name_parts.append(ns['prefix'])
-                if ns['first']: 
-                    name_parts.append(ns['first'])
-                if ns['middle']: 
-                    name_parts.append(ns['middle'])
-                if ns['last']: 
-                    name_parts.append(ns['last'])
-                if ns['suffix']: 
-                    name_parts.append(ns['suffix'])
-                lines.append(f"Name Structure: {', '.join(name_parts)}")
-            if 'title' in vcard_data:
-                lines.append(f"Title: {vcard_data['title']}")
-            if 'organization' in vcard_data:
-                lines.append(f"Organization: {vcard_data['organization']}")
-            if 'phone' in vcard_data:
-                phone_type = f" ({vcard_data['phone_type']})" if 'phone_type' in vcard_data else ""
-                lines.append(f"Phone{phone_type}: {vcard_data['phone']}")
-            if 'email' in vcard_data:
-                email_type = f" ({vcard_data['email_type']})" if 'email_type' in vcard_data else ""
-                lines.append(f"Email{email_type}: {vcard_data['email']}")
-            if 'address' in vcard_data:
-                addr = vcard_data['address']
-                addr_type = f" ({addr['type']})" if 'type' in addr else ""
-                addr_str = []
-                if addr['street']: 
-                    addr_str.append(addr['street'])
-                if addr['city']: 
-                    addr_str.append(addr['city'])
-                if addr['region']: 
-                    addr_str.append(addr['region'])
-                if addr['postal']: 
-                    addr_str.append(addr['postal'])
-                if addr['country']: 
-                    addr_str.append(addr['country'])
-                lines.append(f"Address{addr_type}: {', '.join(addr_str)}")
-            if 'url' in vcard_data:
-                lines.append(f"URL: {vcard_data['url']}")
-            if 'note' in vcard_data:
-                lines.append(f"Note: {vcard_data['note']}")
-
-        elif analysis['type'] == 'Bitcoin Payment':
-            btc_data = analysis['data']
-            lines.append(f"Address: {btc_data['address']}")
-            for key, value in btc_data.items():
-                if key != 'address':
-                    lines.append(f"{key.capitalize()}: {value}")
-
-        elif analysis['type'] == 'JSON':
-            lines.append(json.dumps(analysis['data'], indent=2))
-
-        elif analysis['type'] == 'Email':
-            email_data = analysis['data']
-            lines.append(f"Address: {email_data['address']}")
-            
-            # Format standard parameters
-            param_map = {
-                'subject': 'Subject',
-                'body': 'Body',
-                'cc': 'CC',
-                'bcc': 'BCC',
-                'to': 'To'
-            }
-            
-            for param, value in email_data['parameters'].items():
-                display_name = param_map.get(param, param.capitalize())
-                if param == 'body':
-                    # Handle body with potential newlines
-                    lines.append(f"{display_name}:\n{value.replace('%0A', '\n')}")
-                else:
-                    lines.append(f"{display_name}: {value}")
-
-        elif analysis['type'] in ['Email', 'Phone']:
-            for key, value in analysis['data'].items():
-                lines.append(f"{key.capitalize()}: {value}")
-
-        elif analysis['type'] == 'SMS':
-            sms_data = analysis['data']
-            lines.append(f"Number: {sms_data['number']}")
-            if 'message' in sms_data:
-                lines.append(f"Message: {sms_data['message']}")
-
-        elif analysis['type'] == 'Geographic Location':
-            geo_data = analysis['data']
-            lines.append(f"Latitude: {geo_data['latitude']}")
-            lines.append(f"Longitude: {geo_data['longitude']}")
-            if geo_data['altitude'] is not None:
-                lines.append(f"Altitude: {geo_data['altitude']} meters")
-            if 'parameters' in geo_data:
-                for param, value in geo_data['parameters'].items():
-                    lines.append(f"{param.capitalize()}: {value}")
-            lines.append("\nGoogle Maps Link:")
-            lines.append(f"https://www.google.com/maps?q={geo_data['latitude']},{geo_data['longitude']}")
-
-        elif analysis['type'] == 'Text':
-            text_data = analysis['data']
-            lines.append(f"Length: {text_data['length']} characters")
-            lines.append(f"Preview:\n{text_data['preview']}")
-
-        elif analysis['type'] == 'Empty':
-            lines.append(analysis['data']['message'])
-
-        return '\n'.join(lines)
\ No newline at end of file
+        if isinstance(analysis, Analysis):
+            return analysis.format()
+        # Plain {'type', 'data'} dicts, e.g. results that went through JSON
+        result_type = RESULT_TYPES.get(analysis['type'])
+        if result_type is None:
+            return f"Type: {analysis['type']}"
+        return result_type(None, analysis['data']).format()
+
+ContentAnalyzer.register(_analyze_wifi, ('WIFI:',))
+ContentAnalyzer.register(_analyze_vcard, ('BEGIN:VCARD',))
+ContentAnalyzer.register(_analyze_bitcoin, ('bitcoin:',))
+ContentAnalyzer.register(_analyze_json, _JSON_STARTS)
+ContentAnalyzer.register(_analyze_mailto, ('mailto:',))
+ContentAnalyzer.register(_analyze_tel, ('tel:',))
+ContentAnalyzer.register(_analyze_sms, ('smsto:',))
+ContentAnalyzer.register(_analyze_geo, ('geo:',))
+ContentAnalyzer.register(_analyze_url)
+ContentAnalyzer.register(_analyze_email)
+ContentAnalyzer.register(_analyze_phone)
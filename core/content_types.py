@@ -0,0 +1,374 @@
+import json
+from collections.abc import Mapping
+from urllib.parse import urlparse
+
+# Marks result fields that have not been parsed yet (None is a valid JSON payload)
+_UNPARSED = object()
+
+def _split_params(query, separator='&'):
+    params = {}
+    for param in query.split(separator):
+        if '=' in param:
+            key, val = param.split('=', 1)
+            params[key.lower()] = val
+    return params
+
+def _param_types(key):
+    # TEL;WORK;VOICE -> WORK;VOICE
+    return ';'.join(key.split(';')[1:]) if ';' in key else 'DEFAULT'
+
+def _padded(values, count):
+    return values + [''] * (count - len(values))
+
+class Analysis(Mapping):
+    """Classified payload whose fields are parsed on first access of data.
+
+    Behaves like the {'type': ..., 'data': ...} dict analyze used to return.
+    """
+    __slots__ = ('content', '_data')
+    type = None
+    # Data fields reported as the key and detail columns of ContentAnalyzer.analyze_many
+    summary = (None, None)
+
+    def __init__(self, content, data=_UNPARSED):
+        self.content = content
+        self._data = data
+
+    @property
+    def data(self):
+        if self._data is _UNPARSED:
+            self._data = self.parse()
+        return self._data
+
+    def parse(self):
+        return {}
+
+    def __getitem__(self, key):
+        if key == 'type':
+            return self.type
+        if key == 'data':
+            return self.data
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(('type', 'data'))
+
+    def __len__(self):
+        return 2
+
+    def __reduce__(self):
+        return self.__class__, (self.content, self.data)
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}({self.content!r})"
+
+    def to_dict(self):
+        return {'type': self.type, 'data': self.data}
+
+    def format_lines(self):
+        return []
+
+    def format(self):
+        """Human-readable description of the payload."""
+        return '\n'.join([f"Type: {self.type}"] + self.format_lines())
+
+class URLAnalysis(Analysis):
+    __slots__ = ()
+    type = 'URL'
+    summary = ('domain', 'path')
+
+    def parse(self):
+        parsed = urlparse(self.content)
+        return {
+            'scheme': parsed.scheme,
+            'domain': parsed.netloc,
+            'path': parsed.path or '/',
+            'query': parsed.query,
+            'fragment': parsed.fragment
+        }
+
+    def format_lines(self):
+        data = self.data
+        lines = [f"Scheme: {data['scheme']}", f"Domain: {data['domain']}", f"Path: {data['path']}"]
+        if data['query']:
+            lines.append(f"Query: {data['query']}")
+        if data['fragment']:
+            lines.append(f"Fragment: {data['fragment']}")
+        return lines
+
+class WiFiAnalysis(Analysis):
+    __slots__ = ()
+    type = 'WiFi Configuration'
+    summary = ('ssid', 'encryption')
+
+    def parse(self):
+        params = {}
+        for part in self.content[5:].split(';'):
+            if ':' in part:
+                key, val = part.split(':', 1)
+                params[key] = val
+        return {
+            'ssid': params.get('S', ''),
+            'password': bool(params.get('P')),
+            'encryption': params.get('T', 'Unknown'),
+            'hidden': params.get('H') == 'true'
+        }
+
+    def format_lines(self):
+        data = self.data
+        return [
+            f"SSID: {data['ssid']}",
+            "Password: " + ("*****" if data['password'] else "(none)"),
+            f"Encryption: {data['encryption']}",
+            f"Hidden: {'Yes' if data['hidden'] else 'No'}"
+        ]
+
+class VCardAnalysis(Analysis):
+    __slots__ = ()
+    type = 'vCard'
+    summary = ('name', 'organization')
+
+    def parse(self):
+        data = {}
+        for line in self.content.split('\n'):
+            if ':' not in line:
+                continue
+            key, value = line.split(':', 1)
+            name = key.split(';', 1)[0]
+            if key == 'VERSION':
+                data['version'] = value
+            elif key == 'N':
+                last, first, middle, prefix, suffix = _padded(value.split(';'), 5)[:5]
+                data['name_structured'] = {
+                    'last': last,
+                    'first': first,
+                    'middle': middle,
+                    'prefix': prefix,
+                    'suffix': suffix
+                }
+            elif key == 'FN':
+                data['name'] = value
+            elif key == 'TITLE':
+                data['title'] = value
+            elif name == 'TEL':
+                data['phone'] = value
+                data['phone_type'] = _param_types(key)
+            elif name == 'EMAIL':
+                data['email'] = value
+                data['email_type'] = _param_types(key)
+            elif key == 'ORG':
+                data['organization'] = value
+            elif name == 'ADR':
+                po_box, extended, street, city, region, postal, country = _padded(value.split(';'), 7)[:7]
+                data['address'] = {
+                    'po_box': po_box,
+                    'extended': extended,
+                    'street': street,
+                    'city': city,
+                    'region': region,
+                    'postal': postal,
+                    'country': country,
+                    'type': _param_types(key)
+                }
+            elif key == 'URL':
+                data['url'] = value
+            elif key == 'NOTE':
+                data['note'] = value
+        return data
+
+    def format_lines(self):
+        data = self.data
+        lines = []
+        if 'version' in data:
+            lines.append(f"Version: {data['version']}")
+        if 'name' in data:
+            lines.append(f"Full Name: {data['name']}")
+        if 'name_structured' in data:
+            ns = data['name_structured']
+            name_parts = [ns[part] for part in ('prefix', 'first', 'middle', 'last', 'suffix') if ns[part]]
+            lines.append(f"Name Structure: {', '.join(name_parts)}")
+        if 'title' in data:
+            lines.append(f"Title: {data['title']}")
+        if 'organization' in data:
+            lines.append(f"Organization: {data['organization']}")
+        if 'phone' in data:
+            phone_type = f" ({data['phone_type']})" if 'phone_type' in data else ""
+            lines.append(f"Phone{phone_type}: {data['phone']}")
+        if 'email' in data:
+            email_type = f" ({data['email_type']})" if 'email_type' in data else ""
+            lines.append(f"Email{email_type}: {data['email']}")
+        if 'address' in data:
+            addr = data['address']
+            addr_type = f" ({addr['type']})" if 'type' in addr else ""
+            addr_str = [addr[part] for part in ('street', 'city', 'region', 'postal', 'country') if addr[part]]
+            lines.append(f"Address{addr_type}: {', '.join(addr_str)}")
+        if 'url' in data:
+            lines.append(f"URL: {data['url']}")
+        if 'note' in data:
+            lines.append(f"Note: {data['note']}")
+        return lines
+
+class BitcoinAnalysis(Analysis):
+    __slots__ = ()
+    type = 'Bitcoin Payment'
+    summary = ('address', 'amount')
+
+    def parse(self):
+        address, _, query = self.content[8:].partition('?')
+        data = {'address': address}
+        if query:
+            data.update(_split_params(query.split('?')[0]))
+        return data
+
+    def format_lines(self):
+        data = self.data
+        lines = [f"Address: {data['address']}"]
+        for key, value in data.items():
+            if key != 'address':
+                lines.append(f"{key.capitalize()}: {value}")
+        return lines
+
+class JSONAnalysis(Analysis):
+    """Decoded during classification, since only valid JSON is classified as JSON."""
+    __slots__ = ()
+    type = 'JSON'
+
+    def parse(self):
+        return json.loads(self.content)
+
+    def format_lines(self):
+        return [json.dumps(self.data, indent=2)]
+
+class EmailAnalysis(Analysis):
+    __slots__ = ()
+    type = 'Email'
+    summary = ('address', None)
+
+    # Display names of standard mailto parameters
+    PARAMETER_NAMES = {
+        'subject': 'Subject',
+        'body': 'Body',
+        'cc': 'CC',
+        'bcc': 'BCC',
+        'to': 'To'
+    }
+
+    def parse(self):
+        if self.content[:7].lower() != 'mailto:':
+            return {'address': self.content, 'parameters': {}}
+        # Format: mailto:address?param1=value1&param2=value2
+        address, _, query = self.content[7:].partition('?')
+        return {'address': address, 'parameters': _split_params(query) if query else {}}
+
+    def format_lines(self):
+        data = self.data
+        lines = [f"Address: {data['address']}"]
+        for param, value in data['parameters'].items():
+            display_name = self.PARAMETER_NAMES.get(param, param.capitalize())
+            if param == 'body':
+                # Handle body with potential newlines
+                body = value.replace('%0A', '\n')
+                lines.append(f"{display_name}:\n{body}")
+            else:
+                lines.append(f"{display_name}: {value}")
+        return lines
+
+class PhoneAnalysis(Analysis):
+    __slots__ = ()
+    type = 'Phone'
+    summary = ('number', None)
+
+    def parse(self):
+        is_uri = self.content[:4].lower() == 'tel:'
+        return {'number': self.content[4:] if is_uri else self.content}
+
+    def format_lines(self):
+        return [f"{key.capitalize()}: {value}" for key, value in self.data.items()]
+
+class SMSAnalysis(Analysis):
+    __slots__ = ()
+    type = 'SMS'
+    summary = ('number', 'message')
+
+    def parse(self):
+        parts = self.content[6:].split(':')
+        data = {'number': parts[0]}
+        if len(parts) > 1:
+            data['message'] = parts[1]
+        return data
+
+    def format_lines(self):
+        data = self.data
+        lines = [f"Number: {data['number']}"]
+        if 'message' in data:
+            lines.append(f"Message: {data['message']}")
+        return lines
+
+class GeoAnalysis(Analysis):
+    """Parsed during classification: malformed coordinates are reported as Error instead."""
+    __slots__ = ()
+    type = 'Geographic Location'
+    summary = ('latitude', 'longitude')
+
+    def parse(self):
+        # Format: geo:lat,lng[,alt][;param=value]
+        parts = self.content[4:].split(';')
+        coordinates = parts[0].split(',')
+        data = {
+            'latitude': float(coordinates[0]),
+            'longitude': float(coordinates[1]),
+            'altitude': float(coordinates[2]) if len(coordinates) > 2 else None
+        }
+        if len(parts) > 1:
+            data['parameters'] = _split_params(';'.join(parts[1:]), ';')
+        return data
+
+    def format_lines(self):
+        data = self.data
+        lines = [f"Latitude: {data['latitude']}", f"Longitude: {data['longitude']}"]
+        if data['altitude'] is not None:
+            lines.append(f"Altitude: {data['altitude']} meters")
+        for param, value in data.get('parameters', {}).items():
+            lines.append(f"{param.capitalize()}: {value}")
+        lines.append("\nGoogle Maps Link:")
+        lines.append(f"https://www.google.com/maps?q={data['latitude']},{data['longitude']}")
+        return lines
+
+class TextAnalysis(Analysis):
+    __slots__ = ()
+    type = 'Text'
+
+    def parse(self):
+        return {
+            'length': len(self.content),
+            'preview': self.content[:100] + ('...' if len(self.content) > 100 else '')
+        }
+
+    def format_lines(self):
+        data = self.data
+        return [f"Length: {data['length']} characters", f"Preview:\n{data['preview']}"]
+
+class EmptyAnalysis(Analysis):
+    __slots__ = ()
+    type = 'Empty'
+
+    def parse(self):
+        return {'message': 'No content detected'}
+
+    def format_lines(self):
+        return [self.data['message']]
+
+class ErrorAnalysis(Analysis):
+    __slots__ = ()
+    type = 'Error'
+    summary = (None, 'message')
+
+    def format(self):
+        return f"Error analyzing content: {self.data['message']}"
+
+# Payload type name -> result class
+RESULT_TYPES = {
+    cls.type: cls
+    for cls in (URLAnalysis, WiFiAnalysis, VCardAnalysis, BitcoinAnalysis, JSONAnalysis, EmailAnalysis,
+                PhoneAnalysis, SMSAnalysis, GeoAnalysis, TextAnalysis, EmptyAnalysis, ErrorAnalysis)
+}
@@ -0,0 +1,172 @@
+import base64
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+from core.metrics import METRICS
+from core.qr_extractor import DEFAULT_CASCADE, QRExtractor, QRResult, get_extractor
+
+# Bump when decoder changes make earlier cached results stale
+CACHE_VERSION = 3
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+# Eviction trims the cache to this fraction of max_bytes so it doesn't run on every insert
+EVICT_TO = 0.9
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS decodes (
+    key BLOB PRIMARY KEY,
+    results TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    used REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS decodes_used ON decodes (used);
+"""
+
+def cache_key(image_bytes, cascade=DEFAULT_CASCADE, pyramid=False, max_side=None, scanner_config=()):
+    """128-bit BLAKE2b digest of the encoded image bytes and the decoder settings.
+
+    scanner_config is the ZBarScanner.config of the decoding scanner (symbologies, density,
+    binary mode), so results of differently configured scanners are kept apart.
+    """
+    digest = hashlib.blake2b(image_bytes, digest_size=16)
+    digest.update(repr((CACHE_VERSION, tuple(cascade), bool(pyramid), max_side, scanner_config)).encode('ascii'))
+    return digest.digest()
+
+def _dump_results(results):
+    return json.dumps([
+        {
+            'data': base64.b64encode(result.data).decode('ascii'),
+            'type': result.type,
+            'polygon': result.polygon,
+            'rect': result.rect,
+            'orientation': result.orientation,
+            'stage': result.stage,
+            'raw': result.raw
+        }
+        for result in results
+    ], separators=(',', ':'))
+
+def _load_results(text):
+    return [
+        QRResult(
+            data=base64.b64decode(item['data']),
+            type=item['type'],
+            polygon=tuple(tuple(point) for point in item['polygon']),
+            rect=tuple(item['rect']),
+            orientation=item['orientation'],
+            stage=item['stage'],
+            raw=item['raw']
+        )
+        for item in json.loads(text)
+    ]
+
+class DecodeCache:
+    """Persistent SQLite map from cache_key() to the decoded QRResults of an image.
+
+    Images without a code are cached too (as an empty list), since they are the most
+    expensive to decode. Least recently used entries are evicted once the stored results
+    exceed max_bytes. Several processes may share one cache file.
+    """
+
+    def __init__(self, path, max_bytes=DEFAULT_MAX_BYTES):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._written = 0
+        self._lock = threading.Lock()
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.executescript(SCHEMA)
+        self.evict()
+
+    def get(self, key):
+        """Cached results for key, or None when the image has not been decoded yet."""
+        with self._lock:
+            row = self.connection.execute('SELECT results FROM decodes WHERE key = ?', (key,)).fetchone()
+            if row is None:
+                self.misses += 1
+                METRICS.increment('cache.misses')
+                return None
+            self.hits += 1
+            METRICS.increment('cache.hits')
+            self.connection.execute('UPDATE decodes SET used = ? WHERE key = ?', (time.time(), key))
+        return _load_results(row[0])
+
+    def put(self, key, results):
+        text = _dump_results(results)
+        size = len(key) + len(text)
+        with self._lock:
+            self.connection.execute(
+                'INSERT OR REPLACE INTO decodes (key, results, size, used) VALUES (?, ?, ?, ?)',
+                (key, text, size, time.time())
+            )
+            self._written += size
+            # Re-check the total size only after writing a fair share of the budget
+            if self._written < self.max_bytes * (1 - EVICT_TO):
+                return
+        self.evict()
+
+    def evict(self):
+        """Drop least recently used entries until the cache fits max_bytes."""
+        with self._lock:
+            self._written = 0
+            total = self.connection.execute('SELECT COALESCE(SUM(size), 0) FROM decodes').fetchone()[0]
+            if total <= self.max_bytes:
+                return
+            self.connection.execute(
+                'DELETE FROM decodes WHERE key IN ('
+                ' SELECT key FROM (SELECT key, SUM(size) OVER (ORDER BY used DESC) AS kept FROM decodes)'
+                ' WHERE kept > ?)',
+                (int(self.max_bytes * EVICT_TO),)
+            )
+
+    def close(self):
+        with self._lock:
+            self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+@lru_cache(maxsize=None)
+def open_cache(path, max_bytes=DEFAULT_MAX_BYTES):
+    """DecodeCache shared by every caller in this process (batch workers open each file once)."""
+    return DecodeCache(path, max_bytes)
+
+def _scanner_config(extract):
+    """Scanner settings behind extract: its QRExtractor's, or else the calling thread's one."""
+    extractor = getattr(extract, '__self__', None)
+    if not isinstance(extractor, QRExtractor):
+        extractor = get_extractor()
+    return extractor.scanner.config
+
+def cached_extract(image, cache, extract, **extract_options):
+    """Run extract(image, **extract_options) through cache for file paths and encoded bytes.
+
+    Arrays and PIL images have no encoded form to hash and are always decoded.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        try:
+            with open(image, 'rb') as f:
+                image = f.read()
+        except OSError:
+            raise ValueError("Image not found") from None
+    elif not isinstance(image, (bytes, bytearray, memoryview)):
+        return extract(image, **extract_options)
+
+    key = cache_key(image, scanner_config=_scanner_config(extract), **extract_options)
+    results = cache.get(key)
+    if results is None:
+        results = extract(image, **extract_options)
+        cache.put(key, results)
+    return results
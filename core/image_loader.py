@@ -0,0 +1,57 @@
+import io
+import cv2
+import numpy as np
+from PIL import Image
+
+# Reduced decoding factors, largest first; JPEGs are scaled during DCT decoding
+REDUCED_FLAGS = (
+    (8, cv2.IMREAD_REDUCED_COLOR_8),
+    (4, cv2.IMREAD_REDUCED_COLOR_4),
+    (2, cv2.IMREAD_REDUCED_COLOR_2)
+)
+
+def read_image_bytes(path):
+    """Read an image file once; the bytes can be handed to both the previewer and the extractor."""
+    try:
+        with open(path, 'rb') as f:
+            return f.read()
+    except OSError:
+        raise ValueError("Image not found") from None
+
+def _fit_scale(width, height, max_width, max_height):
+    return min(max_width / width, max_height / height, 1)
+
+def fit_image(pixels, max_width, max_height):
+    """Downscale pixels to fit within max_width x max_height, keeping the aspect ratio."""
+    height, width = pixels.shape[:2]
+    scale = _fit_scale(width, height, max_width, max_height)
+    if scale >= 1:
+        return pixels
+    size = (max(1, round(width * scale)), max(1, round(height * scale)))
+    return cv2.resize(pixels, size, interpolation=cv2.INTER_AREA)
+
+def decode_image(data, max_size=None):
+    """Decode encoded image bytes to a BGR array.
+
+    With max_size=(width, height) the result is fitted within it, and the image is decoded
+    at 1/2, 1/4 or 1/8 scale when that still covers the target, which makes previews of large
+    JPEGs far cheaper than a full decode. The header is read with PIL to pick the factor.
+    """
+    flags = cv2.IMREAD_COLOR
+    if max_size:
+        try:
+            with Image.open(io.BytesIO(data)) as image:
+                width, height = image.size
+        except Exception:
+            pass
+        else:
+            scale = _fit_scale(width, height, *max_size)
+            for factor, flag in REDUCED_FLAGS:
+                if factor * scale <= 1:
+                    flags = flag
+                    break
+
+    pixels = cv2.imdecode(np.frombuffer(data, dtype=np.uint8), flags)
+    if pixels is None:
+        raise ValueError("Could not decode image data")
+    return fit_image(pixels, *max_size) if max_size else pixels
@@ -0,0 +1,35 @@
+import glob
+import os
+
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp')
+
+def collect_inputs(inputs, input_list=None):
+    """Expand files, directories, globs and list files into (source, relative output name) pairs."""
+    entries = list(inputs)
+    if input_list:
+        with open(input_list, encoding='utf-8') as f:
+            entries.extend(line.strip() for line in f if line.strip())
+
+    pairs = []
+    seen = set()
+    for entry in entries:
+        if os.path.isdir(entry):
+            for root, _, files in os.walk(entry):
+                for name in sorted(files):
+                    if name.lower().endswith(IMAGE_EXTENSIONS):
+                        path = os.path.join(root, name)
+                        pairs.append((path, os.path.relpath(path, entry)))
+        elif glob.has_magic(entry):
+            for path in sorted(glob.glob(entry, recursive=True)):
+                if os.path.isfile(path) and path.lower().endswith(IMAGE_EXTENSIONS):
+                    pairs.append((path, os.path.basename(path)))
+        else:
+            pairs.append((entry, os.path.basename(entry)))
+
+    unique = []
+    for path, name in pairs:
+        key = os.path.abspath(path)
+        if key not in seen:
+            seen.add(key)
+            unique.append((path, name))
+    return unique
@@ -0,0 +1,218 @@
+"""Stage timings and counters for the decode/encode pipeline.
+
+Instrumentation is off by default and then costs one attribute check per stage. Enable it
+with METRICS.enable(); stages are then timed into histograms, counters are kept, and every
+finished span is passed to the registered sinks (trace events). Snapshots are plain dicts, so
+worker processes can send theirs to the parent to be merged; with keep_events() they carry the
+worker's trace events too, which merge() passes to the parent's sinks.
+
+    from core.metrics import METRICS, JSONLinesSink
+    METRICS.enable()
+    METRICS.add_sink(JSONLinesSink(open('trace.jsonl', 'w')))
+    ...
+    print(prometheus_text(METRICS.snapshot()))
+"""
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Histogram bucket upper bounds in seconds; the last bucket (+Inf) is implicit
+BUCKETS = (0.0001, 0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+def _empty_histogram():
+    return {'buckets': [0] * (len(BUCKETS) + 1), 'sum': 0.0, 'count': 0, 'max': 0.0}
+
+class Metrics:
+    """Registry of counters and stage duration histograms."""
+
+    def __init__(self):
+        self.enabled = False
+        self.counters = {}
+        self.histograms = {}
+        self.sinks = []
+        # Finished span events awaiting drain(), or None to emit them to the sinks at once
+        self._events = None
+        self._lock = threading.Lock()
+        # Per-thread flag set by suspended()
+        self._local = threading.local()
+
+    def enable(self, enabled=True):
+        self.enabled = enabled
+
+    def add_sink(self, sink):
+        """Register a sink; sink.emit(event) is called with a dict for every finished span."""
+        self.sinks.append(sink)
+
+    def keep_events(self, keep=True):
+        """Buffer span events for drain() instead of emitting them (for worker processes)."""
+        with self._lock:
+            self._events = [] if keep else None
+
+    @contextmanager
+    def suspended(self):
+        """Record nothing from this thread inside the block, e.g. for work timed as a whole elsewhere."""
+        previous = getattr(self._local, 'suspended', False)
+        self._local.suspended = True
+        try:
+            yield
+        finally:
+            self._local.suspended = previous
+
+    def increment(self, name, value=1):
+        if not self.enabled or getattr(self._local, 'suspended', False):
+            return
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe(self, name, seconds):
+        if not self.enabled or getattr(self._local, 'suspended', False):
+            return
+        with self._lock:
+            histogram = self.histograms.get(name)
+            if histogram is None:
+                histogram = self.histograms[name] = _empty_histogram()
+            index = 0
+            while index < len(BUCKETS) and seconds > BUCKETS[index]:
+                index += 1
+            histogram['buckets'][index] += 1
+            histogram['sum'] += seconds
+            histogram['count'] += 1
+            histogram['max'] = max(histogram['max'], seconds)
+
+    @contextmanager
+    def _span(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter() - start
+            self.observe(name, duration)
+            if self.sinks or self._events is not None:
+                event = {
+                    'span': name,
+                    'start': time.time() - duration,
+                    'duration': duration,
+                    'pid': os.getpid(),
+                    'thread': threading.get_ident()
+                }
+                if self._events is not None:
+                    with self._lock:
+                        self._events.append(event)
+                else:
+                    for sink in self.sinks:
+                        sink.emit(event)
+
+    def span(self, name):
+        """Context manager timing one stage (a no-op while disabled)."""
+        if not self.enabled or getattr(self._local, 'suspended', False):
+            return nullcontext()
+        return self._span(name)
+
+    def snapshot(self):
+        with self._lock:
+            snapshot = {
+                'counters': dict(self.counters),
+                'histograms': {
+                    name: dict(histogram, buckets=list(histogram['buckets']))
+                    for name, histogram in self.histograms.items()
+                }
+            }
+            if self._events is not None:
+                snapshot['events'] = list(self._events)
+            return snapshot
+
+    def drain(self):
+        """Return a snapshot and reset, e.g. to ship one task's metrics to the parent process."""
+        snapshot = self.snapshot()
+        self.reset()
+        return snapshot
+
+    def merge(self, snapshot):
+        """Add a snapshot (e.g. from a worker process) into this registry."""
+        with self._lock:
+            for name, value in snapshot['counters'].items():
+                self.counters[name] = self.counters.get(name, 0) + value
+            for name, other in snapshot['histograms'].items():
+                histogram = self.histograms.get(name)
+                if histogram is None:
+                    histogram = self.histograms[name] = _empty_histogram()
+                histogram['buckets'] = [a + b for a, b in zip(histogram['buckets'], other['buckets'])]
+                histogram['sum'] += other['sum']
+                histogram['count'] += other['count']
+                histogram['max'] = max(histogram['max'], other['max'])
+        for event in snapshot.get('events', ()):
+            for sink in self.sinks:
+                sink.emit(event)
+
+    def reset(self):
+        with self._lock:
+            self.counters = {}
+            self.histograms = {}
+            if self._events is not None:
+                self._events = []
+
+# Process-wide registry used by the core modules
+METRICS = Metrics()
+
+class JSONLinesSink:
+    """Writes every span as one JSON line; write_snapshot() appends a final summary line."""
+
+    def __init__(self, file):
+        self.file = file
+        self._lock = threading.Lock()
+
+    def emit(self, event):
+        line = json.dumps(event) + '\n'
+        with self._lock:
+            self.file.write(line)
+
+    def write_snapshot(self, snapshot):
+        with self._lock:
+            self.file.write(json.dumps({'snapshot': snapshot}) + '\n')
+
+def _metric_name(name):
+    return 'qrebuild_' + ''.join(c if c.isalnum() else '_' for c in name)
+
+def prometheus_text(snapshot):
+    """Render a snapshot in the Prometheus text exposition format."""
+    lines = []
+    for name, value in sorted(snapshot['counters'].items()):
+        metric = _metric_name(name) + '_total'
+        lines.append(f'# TYPE {metric} counter')
+        lines.append(f'{metric} {value}')
+    if snapshot['histograms']:
+        lines.append('# TYPE qrebuild_stage_seconds histogram')
+    for name, histogram in sorted(snapshot['histograms'].items()):
+        cumulative = 0
+        for bound, count in zip(BUCKETS + ('+Inf',), histogram['buckets']):
+            cumulative += count
+            lines.append(f'qrebuild_stage_seconds_bucket{{stage="{name}",le="{bound}"}} {cumulative}')
+        lines.append(f'qrebuild_stage_seconds_sum{{stage="{name}"}} {histogram["sum"]}')
+        lines.append(f'qrebuild_stage_seconds_count{{stage="{name}"}} {histogram["count"]}')
+    return '\n'.join(lines) + '\n'
+
+def _quantile(histogram, q):
+    """Upper bound of the bucket holding the q-quantile (the maximum for the +Inf bucket)."""
+    rank = q * histogram['count']
+    seen = 0
+    for bound, count in zip(BUCKETS, histogram['buckets']):
+        seen += count
+        if seen >= rank:
+            return min(bound, histogram['max'])
+    return histogram['max']
+
+def format_breakdown(snapshot):
+    """Human-readable per-stage table, slowest total first."""
+    rows = sorted(snapshot['histograms'].items(), key=lambda item: item[1]['sum'], reverse=True)
+    lines = [f"{'stage':<32} {'calls':>7} {'total s':>9} {'mean ms':>9} {'p95 ms':>9} {'max ms':>9}"]
+    for name, histogram in rows:
+        count = histogram['count']
+        lines.append(
+            f"{name:<32} {count:>7} {histogram['sum']:>9.3f} {histogram['sum'] / count * 1000:>9.2f} "
+            f"{_quantile(histogram, 0.95) * 1000:>9.2f} {histogram['max'] * 1000:>9.2f}"
+        )
+    for name, value in sorted(snapshot['counters'].items()):
+        lines.append(f"{name:<32} {value:>7}")
+    return '\n'.join(lines)
@@ -0,0 +1,259 @@
+import io
+import os
+import tarfile
+import time
+import zipfile
+import numpy as np
+from core.metrics import METRICS
+from core.qr_generator import render_qr
+
+def _dark_runs(matrix, border):
+    """Yield (x, y, length) for every horizontal run of dark modules, offset by the border."""
+    padded = np.zeros((matrix.shape[0], matrix.shape[1] + 2), dtype=np.int8)
+    padded[:, 1:-1] = matrix
+    edges = np.diff(padded, axis=1)
+    for y in range(matrix.shape[0]):
+        starts = np.flatnonzero(edges[y] == 1)
+        ends = np.flatnonzero(edges[y] == -1)
+        for start, end in zip(starts, ends):
+            yield int(start) + border, y + border, int(end - start)
+
+def _raster_encoder(pil_format):
+    def encode(matrix, box_size, border):
+        buffer = io.BytesIO()
+        render_qr(matrix, box_size, border).save(buffer, format=pil_format)
+        return buffer.getvalue()
+    return encode
+
+def encode_svg(matrix, box_size, border):
+    """Vector SVG: one path of module runs, never rasterized."""
+    side = matrix.shape[0] + 2 * border
+    path = ''.join(f"M{x} {y}h{length}v1h-{length}z" for x, y, length in _dark_runs(matrix, border))
+    return (
+        f'<?xml version="1.0" encoding="UTF-8"?>\n'
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{side * box_size}" height="{side * box_size}" '
+        f'viewBox="0 0 {side} {side}" shape-rendering="crispEdges">'
+        f'<rect width="{side}" height="{side}" fill="#fff"/>'
+        f'<path fill="#000" d="{path}"/></svg>\n'
+    ).encode('utf-8')
+
+def encode_eps(matrix, box_size, border):
+    """Vector EPS: module runs drawn with rectfill in a module-unit coordinate system."""
+    side = matrix.shape[0] + 2 * border
+    size = side * box_size
+    lines = [
+        '%!PS-Adobe-3.0 EPSF-3.0',
+        f'%%BoundingBox: 0 0 {size} {size}',
+        '%%EndComments',
+        f'{box_size} {box_size} scale',
+        f'1 setgray 0 0 {side} {side} rectfill',
+        '0 setgray'
+    ]
+    # PostScript's origin is bottom-left, so flip rows
+    lines.extend(f'{x} {side - y - 1} {length} 1 rectfill' for x, y, length in _dark_runs(matrix, border))
+    lines.append('showpage')
+    lines.append('%%EOF')
+    return ('\n'.join(lines) + '\n').encode('ascii')
+
+def encode_pdf_page(matrix, box_size, border):
+    """Vector PDF page content; returns (page size in points, content stream)."""
+    side = matrix.shape[0] + 2 * border
+    ops = [f'{box_size} 0 0 {box_size} 0 0 cm', f'1 g 0 0 {side} {side} re f', '0 g']
+    ops.extend(f'{x} {side - y - 1} {length} 1 re' for x, y, length in _dark_runs(matrix, border))
+    ops.append('f')
+    return side * box_size, ('\n'.join(ops) + '\n').encode('ascii')
+
+# Output formats: name -> (file extension, encoder(matrix, box_size, border) -> payload)
+FORMATS = {
+    'png': ('.png', _raster_encoder('PNG')),
+    'jpg': ('.jpg', _raster_encoder('JPEG')),
+    'bmp': ('.bmp', _raster_encoder('BMP')),
+    'svg': ('.svg', encode_svg),
+    'eps': ('.eps', encode_eps),
+    'pdf': ('.pdf', encode_pdf_page)
+}
+
+def encode_payload(fmt, matrix, box_size=10, border=4):
+    """Serialize a module matrix in the given output format."""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}. Available: {', '.join(FORMATS)}")
+    with METRICS.span(f'serialize.{fmt}'):
+        return FORMATS[fmt][1](matrix, box_size, border)
+
+def _file_format(fmt):
+    """Check the per-file format of a directory or archive sink."""
+    if fmt == 'pdf':
+        # encode_payload('pdf') is a page for PDFSink, not a standalone file
+        raise ValueError("PDF output is one document with a page per code: write to a .pdf path "
+                         "instead of a directory or archive")
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown output format: {fmt}. Available: {', '.join(f for f in FORMATS if f != 'pdf')}")
+    return fmt
+
+class OutputSink:
+    """Destination for rebuilt codes. Payloads are produced by encode() and stored by add()."""
+    fmt = 'png'
+
+    def encode(self, matrix, box_size=10, border=4):
+        return encode_payload(self.fmt, matrix, box_size, border)
+
+    def add(self, name, payload):
+        """Store one encoded code under name (without extension); returns where it went."""
+        raise NotImplementedError
+
+    def write(self, name, matrix, box_size=10, border=4):
+        payload = self.encode(matrix, box_size, border)
+        with METRICS.span('sink.write'):
+            return self.add(name, payload)
+
+    def close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+class DirectorySink(OutputSink):
+    """One file per code inside a directory."""
+
+    def __init__(self, directory, fmt='png'):
+        self.directory = directory
+        self.fmt = _file_format(fmt)
+
+    def add(self, name, payload):
+        path = os.path.join(self.directory, name + FORMATS[self.fmt][0])
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with open(path, 'wb') as f:
+            f.write(payload)
+        return path
+
+class ZipSink(OutputSink):
+    """Streams codes into a ZIP archive straight from memory."""
+
+    def __init__(self, path, fmt='png'):
+        self.path = path
+        self.fmt = _file_format(fmt)
+        # Raster formats are already compressed
+        compression = zipfile.ZIP_DEFLATED if fmt in ('svg', 'eps', 'bmp') else zipfile.ZIP_STORED
+        self.archive = zipfile.ZipFile(path, 'w', compression=compression)
+
+    def add(self, name, payload):
+        member = name.replace(os.sep, '/') + FORMATS[self.fmt][0]
+        self.archive.writestr(member, payload)
+        return f"{self.path}:{member}"
+
+    def close(self):
+        self.archive.close()
+
+class TarSink(OutputSink):
+    """Streams codes into a tar archive (gzip-compressed for .tar.gz / .tgz)."""
+
+    def __init__(self, path, fmt='png'):
+        self.path = path
+        self.fmt = _file_format(fmt)
+        mode = 'w|gz' if path.lower().endswith(('.tar.gz', '.tgz')) else 'w|'
+        self.archive = tarfile.open(path, mode)
+
+    def add(self, name, payload):
+        member = tarfile.TarInfo(name.replace(os.sep, '/') + FORMATS[self.fmt][0])
+        member.size = len(payload)
+        member.mtime = int(time.time())
+        self.archive.addfile(member, io.BytesIO(payload))
+        return f"{self.path}:{member.name}"
+
+    def close(self):
+        self.archive.close()
+
+class PDFSink(OutputSink):
+    """Multi-page vector PDF, one code per page, written incrementally.
+
+    Only object offsets are kept in memory; the page tree and cross-reference table are
+    written on close.
+    """
+    fmt = 'pdf'
+
+    def __init__(self, path):
+        # path may also be a writable binary file object, which is left open on close
+        self.owns_file = isinstance(path, (str, os.PathLike))
+        self.path = path if self.owns_file else getattr(path, 'name', 'stream')
+        self.file = open(path, 'wb') if self.owns_file else path
+        self.closed = False
+        self.offsets = []
+        self.pages = []
+        self.file.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+        # Objects 1 and 2 are the catalog and page tree; the tree is written last
+        self._write_object(b'<< /Type /Catalog /Pages 2 0 R >>')
+        self.offsets.append(None)
+
+    def _write_object(self, body):
+        self.offsets.append(self.file.tell())
+        self.file.write(f'{len(self.offsets)} 0 obj\n'.encode('ascii') + body + b'\nendobj\n')
+        return len(self.offsets)
+
+    def add(self, name, payload):
+        size, content = payload
+        contents = self._write_object(
+            f'<< /Length {len(content)} >>\nstream\n'.encode('ascii') + content + b'endstream'
+        )
+        page = self._write_object(
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {size} {size}] '
+            f'/Contents {contents} 0 R >>'.encode('ascii')
+        )
+        self.pages.append(page)
+        return f"{self.path}#page={len(self.pages)}"
+
+    def close(self):
+        if self.closed:
+            return
+        self.closed = True
+        kids = ' '.join(f'{page} 0 R' for page in self.pages)
+        self.offsets[1] = self.file.tell()
+        self.file.write(f'2 0 obj\n<< /Type /Pages /Kids [{kids}] /Count {len(self.pages)} >>\nendobj\n'
+                        .encode('ascii'))
+        xref = self.file.tell()
+        entries = ''.join(f'{offset:010d} 00000 n \n' for offset in self.offsets)
+        self.file.write(
+            f'xref\n0 {len(self.offsets) + 1}\n0000000000 65535 f \n{entries}'
+            f'trailer\n<< /Size {len(self.offsets) + 1} /Root 1 0 R >>\nstartxref\n{xref}\n%%EOF\n'
+            .encode('ascii')
+        )
+        if self.owns_file:
+            self.file.close()
+
+def encode_document(fmt, matrix, box_size=10, border=4):
+    """Serialize one code as a complete standalone file in memory (a one-page PDF for 'pdf')."""
+    if fmt != 'pdf':
+        return encode_payload(fmt, matrix, box_size, border)
+    buffer = io.BytesIO()
+    with PDFSink(buffer) as sink:
+        sink.write('', matrix, box_size, border)
+    return buffer.getvalue()
+
+def open_sink(output, fmt=None):
+    """Pick a sink from the output path: .zip, .tar[.gz], .pdf, otherwise a directory."""
+    lower = output.lower()
+    if lower.endswith('.zip'):
+        return ZipSink(output, fmt or 'png')
+    if lower.endswith(('.tar', '.tar.gz', '.tgz')):
+        return TarSink(output, fmt or 'png')
+    if lower.endswith('.pdf'):
+        return PDFSink(output)
+    return DirectorySink(output, fmt or 'png')
+
+def save_qr(matrix, output_path, box_size=10, border=4):
+    """Save one module matrix, choosing the writer from the file extension.
+
+    .svg and .eps are written as vectors and .pdf as a one-page vector PDF; any other
+    extension is rendered and saved with PIL.
+    """
+    ext = os.path.splitext(output_path)[1].lower()
+    if ext in ('.svg', '.eps', '.pdf'):
+        payload = encode_document(ext[1:], matrix, box_size, border)
+        with METRICS.span('save'), open(output_path, 'wb') as f:
+            f.write(payload)
+    else:
+        image = render_qr(matrix, box_size, border)
+        with METRICS.span('save'):
+            image.save(output_path)
@@ -0,0 +1,64 @@
+"""Text views of raw QR payloads.
+
+Decoded codes carry their payload as bytes, and rebuilding re-encodes those bytes unchanged.
+The encoding is only guessed here, when a payload has to be shown or analyzed as text.
+"""
+import codecs
+
+# Byte order marks, longest first so UTF-32 LE isn't taken for UTF-16 LE
+_BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16')
+)
+
+# Control characters that don't appear in text payloads (tab, newlines and ESC are allowed)
+_BINARY_BYTES = frozenset(range(0x20)) - {0x09, 0x0a, 0x0d, 0x1b}
+
+def _is_japanese(char):
+    code = ord(char)
+    return (0x3000 <= code <= 0x30ff      # CJK punctuation, hiragana, katakana
+            or 0x4e00 <= code <= 0x9fff   # CJK ideographs
+            or 0xff00 <= code <= 0xffef)  # full-width and half-width forms
+
+def detect_encoding(data):
+    """Best guess at the text encoding of a payload, or None when it looks like binary data.
+
+    Checked in order: a byte order mark, valid UTF-8, Shift-JIS (the QR standard's kanji
+    encoding, accepted only when every non-ASCII character is Japanese) and ISO-8859-1, the
+    standard's default for byte mode.
+    """
+    for bom, encoding in _BOMS:
+        if data.startswith(bom):
+            return encoding
+    if _BINARY_BYTES.intersection(data):
+        return None
+    try:
+        data.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        pass
+    try:
+        text = data.decode('shift_jis')
+    except UnicodeDecodeError:
+        pass
+    else:
+        if all(char.isascii() or _is_japanese(char) for char in text):
+            return 'shift_jis'
+    return 'latin-1'
+
+def payload_text(data):
+    """The payload decoded with detect_encoding; binary data maps byte for byte (ISO-8859-1)."""
+    try:
+        return data.decode(detect_encoding(data) or 'latin-1')
+    except UnicodeDecodeError:
+        # A BOM in front of invalid data
+        return data.decode('latin-1')
+
+def describe_payload(data):
+    """payload_text for display; binary data is summarized as its size instead."""
+    if detect_encoding(data) is None:
+        return f"<{len(data)} bytes of binary data>"
+    return payload_text(data)
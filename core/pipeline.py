@@ -0,0 +1,69 @@
+import os
+from core.metrics import METRICS
+from core.qr_extractor import extract_all_qr
+from core.qr_generator import encode_qr, render_qr
+from core.output_sinks import save_qr
+from core.decode_cache import cached_extract
+
+# Module sizes in pixels tried by verify_qr: the smallest one zbar reads reliably on a clean
+# render first, then a larger one so a scanner resolution limit isn't reported as a mismatch
+VERIFY_BOX_SIZES = (3, 8)
+
+def extract_symbols(image, all_codes=False, cache=None, **extract_options):
+    """Decode the image and return its first QRResult, or every one with all_codes.
+
+    extract_options are passed through to extract_all_qr (cascade, pyramid, max_side). With a
+    DecodeCache, images decoded before with the same settings are not decoded again.
+    """
+    if cache is not None:
+        decoded = cached_extract(image, cache, extract_all_qr, **extract_options)
+    else:
+        decoded = extract_all_qr(image, **extract_options)
+    if not decoded:
+        raise ValueError("No QR code found")
+    return decoded if all_codes else decoded[:1]
+
+def rebuild_qr(input_path, output_path, box_size=10, border=4, error_correction='H', **extract_options):
+    """Extract the QR code from an image and save a clean copy. Returns the decoded QRResult.
+
+    The output format follows the extension of output_path (PNG, JPEG, SVG, EPS, PDF, ...).
+    The payload bytes are re-encoded as they are, whatever their text encoding.
+    """
+    symbol = extract_symbols(input_path, **extract_options)[0]
+    save_qr(encode_qr(symbol.data, error_correction), output_path, box_size, border)
+    return symbol
+
+def verify_qr(matrix, data):
+    """Render a module matrix in memory, decode it again and check it gives back data (bytes).
+
+    Only the plain zbar pass runs: a clean render must decode without preprocessing. A decode
+    that isn't raw (see QRResult) never counts as a match, since transcoded bytes would compare
+    equal on both sides. The work is timed as the verify stage only, so the render and decode
+    stages keep showing just the primary pass.
+    """
+    with METRICS.span('verify'), METRICS.suspended():
+        for box_size in VERIFY_BOX_SIZES:
+            pixels = render_qr(matrix, box_size, 4, output='array')
+            if any(symbol.raw and symbol.data == data for symbol in extract_all_qr(pixels, cascade=('raw',))):
+                return True
+    return False
+
+def numbered_output_path(output_path, index, count):
+    """Return output_path for a single code, or output_path with a _<n> suffix when there are several."""
+    if count == 1:
+        return output_path
+    root, ext = os.path.splitext(output_path)
+    return f"{root}_{index + 1}{ext}"
+
+def rebuild_all_qr(input_path, output_path, box_size=10, border=4, error_correction='H', **extract_options):
+    """Rebuild every code found on the image in one decode pass.
+
+    Returns a list of (QRResult, saved path) tuples, one per code.
+    """
+    decoded = extract_symbols(input_path, all_codes=True, **extract_options)
+    saved = []
+    for index, symbol in enumerate(decoded):
+        path = numbered_output_path(output_path, index, len(decoded))
+        save_qr(encode_qr(symbol.data, error_correction), path, box_size, border)
+        saved.append((symbol, path))
+    return saved
@@ -1,11 +1,385 @@
+import os
+import threading
+from collections import namedtuple
 import cv2
-from pyzbar.pyzbar import decode
-
-def extract_qr(image_path):
-    img = cv2.imread(image_path)
-    if img is None:
-        raise ValueError("Image not found")
-    decoded = decode(cv2.cvtColor(img, cv2.COLOR_BGR2GRAY))
-    if not decoded:
-        raise ValueError("No QR code found")
-    return decoded[0].data.decode("utf-8")
\ No newline at end of file
+import numpy as np
+from core.metrics import METRICS
+from core.payload import payload_text
+from core.zbar_scanner import ZBarScanner
+
+# One decoded symbol: payload bytes, symbol type, corner points, bounding rect, orientation, the
+# name of the preprocessing stage that produced it and raw: False when the decoder handed the
+# payload over as text (OpenCV, or zbar without binary mode) and non-ASCII bytes may differ
+# from the ones stored in the code
+QRResult = namedtuple('QRResult', 'data type polygon rect orientation stage raw', defaults=(None, True))
+
+# Longest side used by the 'downscale' stage
+DOWNSCALE_MAX_SIDE = 1000
+
+# Longest side of the coarse copy searched for finder patterns in pyramid mode
+PYRAMID_COARSE_SIDE = 1024
+
+# Longest side of any image region handed to the decoders in pyramid mode
+MAX_WORKING_SIDE = 2048
+
+_COLOR_TO_GRAY = {
+    3: cv2.COLOR_BGR2GRAY,
+    4: cv2.COLOR_BGRA2GRAY
+}
+
+def _load_gray(image, dst=None):
+    """Return a single-channel uint8 array for a path, encoded buffer, numpy array or PIL image.
+
+    Encoded buffers (bytes, bytearray, memoryview) are decoded in place with cv2.imdecode and
+    numpy arrays are expected in OpenCV's BGR(A) channel order. Images that are already
+    single-channel are passed through without a color conversion; color arrays are converted
+    into dst when it is given and has the right shape.
+    """
+    if isinstance(image, (str, os.PathLike)):
+        with METRICS.span('load.imread'):
+            gray = cv2.imread(os.fspath(image), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError("Image not found")
+        return gray
+
+    if isinstance(image, (bytes, bytearray, memoryview)):
+        with METRICS.span('load.imdecode'):
+            gray = cv2.imdecode(np.frombuffer(image, dtype=np.uint8), cv2.IMREAD_GRAYSCALE)
+        if gray is None:
+            raise ValueError("Could not decode image data")
+        return gray
+
+    if hasattr(image, 'convert') and hasattr(image, 'mode'):
+        # PIL image
+        with METRICS.span('load.gray'):
+            return np.asarray(image if image.mode == 'L' else image.convert('L'))
+
+    if isinstance(image, np.ndarray):
+        if image.dtype != np.uint8:
+            raise ValueError(f"Unsupported image dtype: {image.dtype}")
+        if image.ndim == 3 and image.shape[2] == 1:
+            image = image[:, :, 0]
+        if image.ndim == 2:
+            return image
+        if image.ndim == 3 and image.shape[2] in _COLOR_TO_GRAY:
+            if dst is not None and dst.shape != image.shape[:2]:
+                dst = None
+            with METRICS.span('load.gray'):
+                return cv2.cvtColor(image, _COLOR_TO_GRAY[image.shape[2]], dst=dst)
+        raise ValueError(f"Unsupported image shape: {image.shape}")
+
+    raise TypeError(f"Unsupported image input: {type(image).__name__}")
+
+def _zbar_decode(extractor, gray):
+    binary = extractor.scanner.binary
+    return [QRResult(*symbol, raw=binary or symbol[0].isascii()) for symbol in extractor.scanner.scan(gray)]
+
+def _opencv_decode(extractor, gray):
+    found, texts, points, _ = extractor.detector.detectAndDecodeMulti(gray)
+    if not found:
+        return []
+    results = []
+    for text, corners in zip(texts, points):
+        if not text:
+            continue
+        polygon = tuple((int(round(x)), int(round(y))) for x, y in corners)
+        data = text.encode('utf-8')
+        results.append(QRResult(
+            data=data,
+            type='QRCODE',
+            polygon=polygon,
+            rect=_bounding_rect(polygon),
+            orientation=None,
+            # OpenCV returns text; only ASCII survives its conversion unchanged
+            raw=data.isascii()
+        ))
+    return results
+
+def _downscale(gray):
+    small, matrix = _cap_resolution(gray, DOWNSCALE_MAX_SIDE)
+    return (small, matrix) if matrix is not None else None
+
+def _invert(gray):
+    return cv2.bitwise_not(gray), None
+
+def _clahe(gray):
+    return cv2.createCLAHE(clipLimit=2.0, tileGridSize=(8, 8)).apply(gray), None
+
+def _adaptive_threshold(gray):
+    block_size = max(11, (min(gray.shape[:2]) // 40) | 1)
+    return cv2.adaptiveThreshold(gray, 255, cv2.ADAPTIVE_THRESH_GAUSSIAN_C, cv2.THRESH_BINARY,
+                                 block_size, 2), None
+
+def _rotate_45(gray):
+    height, width = gray.shape[:2]
+    matrix = cv2.getRotationMatrix2D((width / 2, height / 2), 45, 1.0)
+    # Grow the canvas so the rotated corners stay inside the image
+    side = int(np.ceil((width + height) / np.sqrt(2)))
+    matrix[0, 2] += (side - width) / 2
+    matrix[1, 2] += (side - height) / 2
+    rotated = cv2.warpAffine(gray, matrix, (side, side), borderValue=255)
+    return rotated, cv2.invertAffineTransform(matrix)
+
+# Preprocessing stages: name -> (transform, decoder). A transform returns the variant image and
+# an optional 2x3 affine matrix mapping its coordinates back to the original, or None to skip.
+# Decoders take the QRExtractor whose scanner / detector they use and the image.
+PREPROCESSING_STAGES = {
+    'raw': (None, _zbar_decode),
+    'downscale': (_downscale, _zbar_decode),
+    'invert': (_invert, _zbar_decode),
+    'clahe': (_clahe, _zbar_decode),
+    'adaptive_threshold': (_adaptive_threshold, _zbar_decode),
+    'rotate_45': (_rotate_45, _zbar_decode),
+    'opencv': (None, _opencv_decode)
+}
+
+# Cheapest variants first; the cascade stops at the first stage that decodes anything
+DEFAULT_CASCADE = ('raw', 'downscale', 'invert', 'clahe', 'adaptive_threshold', 'rotate_45', 'opencv')
+
+def _bounding_rect(polygon):
+    xs = [x for x, _ in polygon]
+    ys = [y for _, y in polygon]
+    return (min(xs), min(ys), max(xs) - min(xs), max(ys) - min(ys))
+
+def _map_to_original(result, matrix, stage=None):
+    if matrix is not None:
+        points = np.array(result.polygon, dtype=np.float64)
+        mapped = points @ matrix[:, :2].T + matrix[:, 2]
+        polygon = tuple((int(round(x)), int(round(y))) for x, y in mapped)
+        result = result._replace(polygon=polygon, rect=_bounding_rect(polygon))
+    return result._replace(stage=stage) if stage else result
+
+def _cap_resolution(gray, max_side):
+    """Downscale gray so its longest side fits max_side; returns (image, matrix back to gray)."""
+    scale = max_side / max(gray.shape[:2]) if max_side else 1
+    if scale >= 1:
+        return gray, None
+    small = cv2.resize(gray, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+    return small, np.array([[1 / scale, 0, 0], [0, 1 / scale, 0]])
+
+def _run_cascade(extractor, gray, cascade):
+    for stage in cascade:
+        transform, decoder = PREPROCESSING_STAGES[stage]
+        variant, matrix = gray, None
+        if transform is not None:
+            with METRICS.span(f'preprocess.{stage}'):
+                prepared = transform(gray)
+            if prepared is None:
+                continue
+            variant, matrix = prepared
+        with METRICS.span(f'decode.{stage}'):
+            decoded = decoder(extractor, variant)
+        if decoded:
+            METRICS.increment(f'cascade.{stage}.hits')
+            return [_map_to_original(result, matrix, stage) for result in decoded]
+    return []
+
+def _finder_patterns(binary):
+    """Return (x, y, w, h) boxes of nested square contours that look like QR finder patterns."""
+    contours, hierarchy = cv2.findContours(binary, cv2.RETR_TREE, cv2.CHAIN_APPROX_SIMPLE)
+    if hierarchy is None:
+        return []
+    hierarchy = hierarchy[0]
+    boxes = []
+    for index, contour in enumerate(contours):
+        child = hierarchy[index][2]
+        # A finder pattern is a dark ring around a light ring around a dark core
+        if child < 0 or hierarchy[child][2] < 0:
+            continue
+        x, y, w, h = cv2.boundingRect(contour)
+        if w < 7 or h < 7 or not 0.5 <= w / h <= 2:
+            continue
+        boxes.append((x, y, w, h))
+    return boxes
+
+def _group_finders(boxes):
+    """Cluster finder boxes that plausibly belong to the same symbol."""
+    parent = list(range(len(boxes)))
+
+    def root(i):
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    centers = [(x + w / 2, y + h / 2) for x, y, w, h in boxes]
+    for i, (_, _, wi, hi) in enumerate(boxes):
+        neighbours = []
+        for j, (_, _, wj, hj) in enumerate(boxes):
+            size_i, size_j = max(wi, hi), max(wj, hj)
+            if j == i or max(size_i, size_j) > 1.5 * min(size_i, size_j):
+                continue
+            # Version 40 spans 177 modules, about 25 finder widths
+            distance = np.hypot(centers[i][0] - centers[j][0], centers[i][1] - centers[j][1])
+            if distance <= 25 * max(size_i, size_j):
+                neighbours.append((distance, j))
+        # A finder shares its symbol with its two nearest compatible finders
+        for _, j in sorted(neighbours)[:2]:
+            parent[root(i)] = root(j)
+
+    groups = {}
+    for i in range(len(boxes)):
+        groups.setdefault(root(i), []).append(i)
+    return [[boxes[i] for i in members] for members in groups.values()]
+
+def _region_for_group(group):
+    """Return the padded bounding box of a finder group, including the finder-less corner."""
+    points = [(x, y) for x, y, _, _ in group] + [(x + w, y + h) for x, y, w, h in group]
+    if len(group) == 3:
+        # The corner finder sits opposite the longest side; complete the parallelogram
+        centers = [np.array((x + w / 2, y + h / 2)) for x, y, w, h in group]
+        pairs = [(0, 1, 2), (0, 2, 1), (1, 2, 0)]
+        a, c, corner = max(pairs, key=lambda p: np.linalg.norm(centers[p[0]] - centers[p[1]]))
+        missing = centers[a] + centers[c] - centers[corner]
+        points.append(tuple(missing))
+    pad = max(max(w, h) for _, _, w, h in group)
+    xs = [x for x, _ in points]
+    ys = [y for _, y in points]
+    return min(xs) - pad, min(ys) - pad, max(xs) + pad, max(ys) + pad
+
+def find_qr_regions(gray, coarse_side=PYRAMID_COARSE_SIDE):
+    """Locate candidate QR regions on a downscaled copy of gray.
+
+    Returns full-resolution (x0, y0, x1, y1) boxes clamped to the image.
+    """
+    coarse, matrix = _cap_resolution(gray, coarse_side)
+    scale = matrix[0, 0] if matrix is not None else 1
+    block_size = max(11, (min(coarse.shape[:2]) // 30) | 1)
+    binary = cv2.adaptiveThreshold(coarse, 255, cv2.ADAPTIVE_THRESH_MEAN_C, cv2.THRESH_BINARY_INV,
+                                   block_size, 5)
+
+    height, width = gray.shape[:2]
+    regions = []
+    for group in _group_finders(_finder_patterns(binary)):
+        x0, y0, x1, y1 = _region_for_group(group)
+        regions.append((
+            max(0, int(x0 * scale)), max(0, int(y0 * scale)),
+            min(width, int(np.ceil(x1 * scale))), min(height, int(np.ceil(y1 * scale)))
+        ))
+    # Reading order: top to bottom, left to right
+    regions.sort(key=lambda r: (r[1], r[0]))
+    return regions
+
+def _is_duplicate(result, results):
+    cx, cy = result.rect[0] + result.rect[2] / 2, result.rect[1] + result.rect[3] / 2
+    for other in results:
+        if other.data != result.data:
+            continue
+        ox, oy = other.rect[0] + other.rect[2] / 2, other.rect[1] + other.rect[3] / 2
+        if abs(cx - ox) <= max(other.rect[2], 1) / 2 and abs(cy - oy) <= max(other.rect[3], 1) / 2:
+            return True
+    return False
+
+def _extract_pyramid(extractor, gray, cascade, max_side):
+    """Decode only the full-resolution ROIs around finder patterns found on a coarse copy."""
+    results = []
+    with METRICS.span('pyramid.locate'):
+        regions = find_qr_regions(gray)
+    for x0, y0, x1, y1 in regions:
+        roi, matrix = _cap_resolution(gray[y0:y1, x0:x1], max_side)
+        offset = np.array([[1, 0, x0], [0, 1, y0]], dtype=np.float64)
+        if matrix is not None:
+            offset[:, :2] = matrix[:, :2]
+        for result in _run_cascade(extractor, roi, cascade):
+            result = _map_to_original(result, offset)
+            if not _is_duplicate(result, results):
+                results.append(result)
+    if results:
+        return results
+
+    # No usable region: fall back to the whole frame at the working resolution cap
+    frame, matrix = _cap_resolution(gray, max_side)
+    return [_map_to_original(result, matrix) for result in _run_cascade(extractor, frame, cascade)]
+
+def parse_cascade(spec):
+    """Turn a comma-separated list of stage names into a validated cascade tuple."""
+    stages = tuple(name.strip() for name in spec.split(',') if name.strip())
+    unknown = [name for name in stages if name not in PREPROCESSING_STAGES]
+    if unknown:
+        raise ValueError(f"Unknown preprocessing stage(s): {', '.join(unknown)}. "
+                         f"Available: {', '.join(PREPROCESSING_STAGES)}")
+    return stages
+
+class QRExtractor:
+    """Decoder state reused across images: a configured zbar scanner, an OpenCV QR detector and
+    the grayscale conversion buffer of the last color image.
+
+    Not thread-safe: keep one per thread. The module-level extract_all_qr / extract_qr use the
+    calling thread's instance from get_extractor(), so worker pools and GUI threads get this
+    for free. density, symbols and cache configure the zbar scanner (see ZBarScanner).
+    """
+
+    def __init__(self, cascade=DEFAULT_CASCADE, pyramid=False, max_side=None, density=1, symbols=None,
+                 cache=False):
+        self.cascade = cascade
+        self.pyramid = pyramid
+        self.max_side = max_side
+        if symbols is None:
+            self.scanner = ZBarScanner(density=density, cache=cache)
+        else:
+            self.scanner = ZBarScanner(symbols, density, cache)
+        self._detector = None
+        self._gray = None
+
+    @property
+    def detector(self):
+        if self._detector is None:
+            self._detector = cv2.QRCodeDetector()
+        return self._detector
+
+    def extract_all(self, image, cascade=None, pyramid=None, max_side=None):
+        """Decode every symbol in the image, each cascade stage being a single decoder pass.
+
+        image may be a file path, encoded image bytes, a numpy array or a PIL image. When the
+        raw grayscale frame yields nothing, the remaining cascade stages are tried in order
+        until one decodes; each result records the winning stage in its `stage` field.
+
+        With pyramid=True, finder patterns are located on a coarse copy first and only the
+        cropped full-resolution regions around them are decoded. max_side caps the longest side
+        of any image handed to the decoders (MAX_WORKING_SIDE by default in pyramid mode,
+        uncapped otherwise). Arguments left as None use the extractor's settings.
+        """
+        cascade = self.cascade if cascade is None else cascade
+        pyramid = self.pyramid if pyramid is None else pyramid
+        max_side = self.max_side if max_side is None else max_side
+
+        METRICS.increment('extract.images')
+        with METRICS.span('extract'):
+            gray = _load_gray(image, self._gray)
+            if gray.base is None and gray is not image:
+                # A conversion result we own: reuse it for the next image of the same size
+                self._gray = gray
+            if pyramid:
+                results = _extract_pyramid(self, gray, cascade, max_side or MAX_WORKING_SIDE)
+            else:
+                frame, matrix = _cap_resolution(gray, max_side)
+                results = [_map_to_original(result, matrix) for result in _run_cascade(self, frame, cascade)]
+        METRICS.increment('extract.symbols', len(results))
+        return results
+
+    def extract(self, image, cascade=None, pyramid=None, max_side=None):
+        """Text of the first decoded symbol (see core.payload); ValueError when there is none."""
+        decoded = self.extract_all(image, cascade, pyramid, max_side)
+        if not decoded:
+            raise ValueError("No QR code found")
+        return payload_text(decoded[0].data)
+
+_local = threading.local()
+
+def get_extractor(density=1, cache=False):
+    """The calling thread's QRExtractor for these scanner settings, created on first use."""
+    extractors = getattr(_local, 'extractors', None)
+    if extractors is None:
+        extractors = _local.extractors = {}
+    key = (density, bool(cache))
+    extractor = extractors.get(key)
+    if extractor is None:
+        extractor = extractors[key] = QRExtractor(density=density, cache=cache)
+    return extractor
+
+def extract_all_qr(image, cascade=DEFAULT_CASCADE, pyramid=False, max_side=None):
+    """Decode every symbol in the image with the calling thread's QRExtractor (see extract_all)."""
+    return get_extractor().extract_all(image, cascade, pyramid, max_side)
+
+def extract_qr(image, cascade=DEFAULT_CASCADE, pyramid=False, max_side=None):
+    return get_extractor().extract(image, cascade, pyramid, max_side)
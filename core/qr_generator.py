@@ -1,19 +1,87 @@
+from functools import lru_cache
+import numpy as np
 import qrcode
+from qrcode.exceptions import DataOverflowError
+from PIL import Image
+from core.metrics import METRICS
 
-def generate_qr(data, box_size=10, border=4, error_correction='H'):
-    error_levels = {
-        'L': qrcode.constants.ERROR_CORRECT_L,
-        'M': qrcode.constants.ERROR_CORRECT_M,
-        'Q': qrcode.constants.ERROR_CORRECT_Q,
-        'H': qrcode.constants.ERROR_CORRECT_H
-    }
-    
-    qr = qrcode.QRCode(
-        version=1,
-        error_correction=error_levels.get(error_correction, qrcode.constants.ERROR_CORRECT_H),
-        box_size=box_size,
-        border=border
-    )
+# Number of encoded symbols kept by encode_qr
+ENCODE_CACHE_SIZE = 256
+
+ERROR_LEVELS = {
+    'L': qrcode.constants.ERROR_CORRECT_L,
+    'M': qrcode.constants.ERROR_CORRECT_M,
+    'Q': qrcode.constants.ERROR_CORRECT_Q,
+    'H': qrcode.constants.ERROR_CORRECT_H
+}
+
+def _check_version(version):
+    if not isinstance(version, int) or not 1 <= version <= 40:
+        raise ValueError(f"Invalid QR version (was {version}, expected 1 to 40)")
+
+def data_version(data, error_correction='H'):
+    """Smallest QR version that holds data at the given error correction level."""
+    qr = qrcode.QRCode(error_correction=ERROR_LEVELS.get(error_correction, qrcode.constants.ERROR_CORRECT_H))
     qr.add_data(data)
-    qr.make(fit=True)
-    return qr.make_image(fill_color="black", back_color="white")
\ No newline at end of file
+    try:
+        return qr.best_fit()
+    except (DataOverflowError, ValueError):
+        raise ValueError(f"Data too long for a QR code at level {error_correction}") from None
+
+@lru_cache(maxsize=ENCODE_CACHE_SIZE)
+def encode_qr(data, error_correction='H', version=None):
+    """Encode data into a boolean QR module matrix (True = dark), cached on its arguments.
+
+    data is text (stored as UTF-8) or bytes, which are stored unchanged, so a decoded payload
+    in any encoding, or binary data, is rebuilt bit for bit. Text and its UTF-8 bytes give the
+    same symbol.
+    Without a version the smallest one that fits is searched; a pinned version (1-40) skips the
+    search and raises ValueError when data does not fit. The version and mask search only run on
+    a cache miss. The returned array is shared between callers and is read-only; draw it with
+    render_qr.
+    """
+    if version is not None:
+        _check_version(version)
+    with METRICS.span('encode'):
+        qr = qrcode.QRCode(
+            version=version or 1,
+            error_correction=ERROR_LEVELS.get(error_correction, qrcode.constants.ERROR_CORRECT_H),
+            border=0
+        )
+        qr.add_data(data)
+        try:
+            qr.make(fit=version is None)
+        except DataOverflowError:
+            raise ValueError(f"Data too long for QR version {version} at level {error_correction}") from None
+        matrix = np.array(qr.modules, dtype=bool)
+    matrix.flags.writeable = False
+    return matrix
+
+def render_qr(matrix, box_size=10, border=4, output='pil'):
+    """Draw a module matrix with the given module size and border, black on white.
+
+    output selects the result: 'pil' for a 1-bit PIL image, 'array' for a 2D uint8 array
+    (0 = black, 255 = white) or 'buffer' for a memoryview over that array's pixels.
+    """
+    box_size, border = int(box_size), int(border)
+    if box_size <= 0:
+        raise ValueError(f"Invalid box size (was {box_size}, expected larger than 0)")
+    if border < 0:
+        raise ValueError(f"Invalid border value (was {border}, expected 0 or larger than that)")
+
+    with METRICS.span('render'):
+        light = np.pad(~matrix, border, constant_values=True)
+        light = np.repeat(np.repeat(light, box_size, axis=0), box_size, axis=1)
+
+        if output == 'pil':
+            height, width = light.shape
+            return Image.frombytes('1', (width, height), np.packbits(light, axis=1).tobytes())
+        pixels = light.view(np.uint8) * np.uint8(255)
+    if output == 'array':
+        return pixels
+    if output == 'buffer':
+        return memoryview(pixels)
+    raise ValueError(f"Unknown render output: {output}")
+
+def generate_qr(data, box_size=10, border=4, error_correction='H', version=None):
+    return render_qr(encode_qr(data, error_correction, version), box_size, border)
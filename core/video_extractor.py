@@ -0,0 +1,85 @@
+import time
+from collections import namedtuple
+import cv2
+from core.qr_extractor import extract_all_qr
+
+# One sighting of a payload: seconds into the stream, frame number, raw bytes and corner points
+QREvent = namedtuple('QREvent', 'timestamp frame_index data polygon')
+
+# Frames decoded per second of video matter more than hard-frame recovery, so only the raw pass runs
+VIDEO_CASCADE = ('raw',)
+
+# Size of the thumbnails compared by the motion filter
+MOTION_THUMBNAIL = (64, 48)
+
+def _open_capture(source):
+    """Open a video file, stream URL or device index; returns (capture, is_device)."""
+    if isinstance(source, str) and source.isdigit():
+        source = int(source)
+    capture = cv2.VideoCapture(source)
+    if not capture.isOpened():
+        raise ValueError(f"Could not open video source: {source}")
+    return capture, isinstance(source, int)
+
+def iter_frames(source, stride=1):
+    """Yield (frame_index, timestamp, gray frame) for every stride-th frame of a video or device.
+
+    Skipped frames are only grabbed, never decoded. Files are timestamped from their own
+    clock, capture devices from the wall clock since the stream opened.
+    """
+    capture, is_device = _open_capture(source)
+    started = time.monotonic()
+    index = 0
+    try:
+        while True:
+            if index % stride:
+                if not capture.grab():
+                    break
+            else:
+                ok, frame = capture.read()
+                if not ok:
+                    break
+                if is_device:
+                    timestamp = time.monotonic() - started
+                else:
+                    timestamp = capture.get(cv2.CAP_PROP_POS_MSEC) / 1000
+                if frame.ndim == 3:
+                    frame = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+                yield index, timestamp, frame
+            index += 1
+    finally:
+        capture.release()
+
+def skip_still_frames(frames, threshold=2.0):
+    """Drop frames whose mean absolute difference to the last kept frame is below threshold (0-255)."""
+    previous = None
+    for index, timestamp, gray in frames:
+        thumbnail = cv2.resize(gray, MOTION_THUMBNAIL, interpolation=cv2.INTER_AREA)
+        if previous is not None and cv2.absdiff(thumbnail, previous).mean() < threshold:
+            continue
+        previous = thumbnail
+        yield index, timestamp, gray
+
+def stream_qr_events(source, stride=1, motion_threshold=2.0, dedup_window=5.0, cascade=VIDEO_CASCADE,
+                     **extract_options):
+    """Decode a video file or capture device into a stream of QREvents.
+
+    Every stride-th frame is read, frames without motion are skipped (motion_threshold=0
+    disables that), and a payload is only reported again once it has been absent for
+    dedup_window seconds.
+    """
+    frames = iter_frames(source, stride)
+    if motion_threshold > 0:
+        frames = skip_still_frames(frames, motion_threshold)
+
+    last_seen = {}
+    for index, timestamp, gray in frames:
+        for result in extract_all_qr(gray, cascade, **extract_options):
+            previous = last_seen.get(result.data)
+            last_seen[result.data] = timestamp
+            if previous is None or timestamp - previous > dedup_window:
+                yield QREvent(timestamp, index, result.data, result.polygon)
+
+        # Forget payloads that left the window so long streams keep a bounded table
+        if len(last_seen) > 1024:
+            last_seen = {data: seen for data, seen in last_seen.items() if timestamp - seen <= dedup_window}
@@ -0,0 +1,154 @@
+"""A zbar image scanner kept alive between images.
+
+pyzbar.decode creates, configures and destroys a scanner and an image for every call, and
+copies the pixels with tobytes(). ZBarScanner does that setup once and hands zbar a pointer to
+the numpy buffer directly (copying only views that aren't contiguous, into a reused buffer).
+It uses pyzbar's own ctypes bindings, so the same libzbar is loaded as before.
+"""
+import warnings
+from ctypes import POINTER, byref, c_int, c_uint, c_void_p, string_at
+import numpy as np
+from pyzbar.locations import bounding_box, convex_hull
+from pyzbar.wrapper import (
+    ZBarConfig, ZBarOrientation, ZBarSymbol, zbar_function, zbar_image_create, zbar_image_destroy,
+    zbar_image_first_symbol, zbar_image_scanner, zbar_image_scanner_create, zbar_image_scanner_destroy,
+    zbar_image_scanner_set_config, zbar_image_set_data, zbar_image_set_format, zbar_image_set_size,
+    zbar_scan_image, zbar_symbol_get_data, zbar_symbol_get_data_length, zbar_symbol_get_loc_size,
+    zbar_symbol_get_loc_x, zbar_symbol_get_loc_y, zbar_symbol_get_orientation, zbar_symbol_next
+)
+
+# FOURCC of 8-bit grayscale pixels ('Y800')
+Y800 = 808466521
+
+# ZBAR_CFG_BINARY: return QR payloads as raw bytes instead of converting them to UTF-8 with a
+# guessed encoding. Missing from pyzbar's ZBarConfig. Only zbar 0.23.1 and newer know it; older
+# releases (including the 0.10 bundled with pyzbar's Windows wheels) silently ignore it.
+CFG_BINARY = 4
+BINARY_MIN_VERSION = (0, 23, 1)
+
+# Not bound by pyzbar
+zbar_image_scanner_enable_cache = zbar_function(
+    'zbar_image_scanner_enable_cache',
+    None,
+    POINTER(zbar_image_scanner),
+    c_int
+)
+
+# pyzbar binds the two-argument form of zbar 0.10; newer releases also report the patch level.
+# Older libraries ignore the extra pointer, leaving patch at 0.
+_zbar_version = zbar_function(
+    'zbar_version',
+    c_int,
+    POINTER(c_uint),
+    POINTER(c_uint),
+    POINTER(c_uint)
+)
+
+def zbar_version():
+    """(major, minor, patch) of the loaded libzbar."""
+    major, minor, patch = c_uint(), c_uint(), c_uint()
+    _zbar_version(byref(major), byref(minor), byref(patch))
+    return major.value, minor.value, patch.value
+
+class ZBarScanner:
+    """Configured zbar scanner and image handle, reused for every scan. Not thread-safe.
+
+    symbols restricts decoding to those symbologies (QR only by default, which also skips the
+    1D decoders' work). density > 1 scans only every Nth row and column: faster, but small or
+    damaged codes may be missed. cache enables zbar's inter-image result cache, which only
+    reports symbols seen in consecutive images; it suits video frames, not single images.
+    QR payloads are returned as the raw bytes stored in the code when libzbar supports it
+    (binary is then True); older libraries warn once and transcode non-UTF-8 payloads.
+    """
+
+    def __init__(self, symbols=(ZBarSymbol.QRCODE,), density=1, cache=False):
+        self._scanner = zbar_image_scanner_create()
+        if not self._scanner:
+            raise RuntimeError("Could not create zbar image scanner")
+        self._image = zbar_image_create()
+        if not self._image:
+            zbar_image_scanner_destroy(self._scanner)
+            raise RuntimeError("Could not create zbar image")
+        zbar_image_set_format(self._image, Y800)
+
+        if symbols:
+            # Symbol type 0 addresses every symbology at once
+            zbar_image_scanner_set_config(self._scanner, ZBarSymbol.NONE, ZBarConfig.CFG_ENABLE, 0)
+            for symbol in symbols:
+                zbar_image_scanner_set_config(self._scanner, symbol, ZBarConfig.CFG_ENABLE, 1)
+        # True when QR payloads come back exactly as stored; otherwise zbar converts non-UTF-8
+        # payloads to UTF-8 and only ASCII data is exact
+        version = zbar_version()
+        self.binary = (version >= BINARY_MIN_VERSION
+                       and zbar_image_scanner_set_config(self._scanner, ZBarSymbol.QRCODE, CFG_BINARY, 1) == 0)
+        if not self.binary:
+            warnings.warn(f"libzbar {'.'.join(map(str, version))} has no raw binary mode: non-UTF-8 QR "
+                          f"payloads are transcoded and can't be rebuilt byte for byte", RuntimeWarning,
+                          stacklevel=2)
+        zbar_image_scanner_set_config(self._scanner, ZBarSymbol.NONE, ZBarConfig.CFG_X_DENSITY, density)
+        zbar_image_scanner_set_config(self._scanner, ZBarSymbol.NONE, ZBarConfig.CFG_Y_DENSITY, density)
+        zbar_image_scanner_enable_cache(self._scanner, int(cache))
+        # Settings that change what scan() returns for the same image (part of decode cache keys)
+        self.config = (tuple(sorted(map(int, symbols or ()))), density, bool(cache), self.binary)
+
+        # Contiguous copy of strided inputs, grown as needed
+        self._scratch = np.empty(0, dtype=np.uint8)
+        # The array zbar currently points into; kept alive until the next scan
+        self._pixels = None
+
+    def _contiguous(self, gray):
+        if gray.flags.c_contiguous:
+            return gray
+        if self._scratch.size < gray.size:
+            self._scratch = np.empty(gray.size, dtype=np.uint8)
+        pixels = self._scratch[:gray.size].reshape(gray.shape)
+        np.copyto(pixels, gray)
+        return pixels
+
+    def scan(self, gray):
+        """Decode a 2D uint8 array; returns a list of (data, type, polygon, rect, orientation)."""
+        if self._scanner is None:
+            raise RuntimeError("Scanner is closed")
+        pixels = self._pixels = self._contiguous(gray)
+        height, width = pixels.shape
+        zbar_image_set_size(self._image, width, height)
+        zbar_image_set_data(self._image, pixels.ctypes.data_as(c_void_p), pixels.size, None)
+        if zbar_scan_image(self._scanner, self._image) < 0:
+            raise RuntimeError("zbar could not scan the image")
+
+        decoded = []
+        symbol = zbar_image_first_symbol(self._image)
+        while symbol:
+            polygon = convex_hull(
+                (zbar_symbol_get_loc_x(symbol, index), zbar_symbol_get_loc_y(symbol, index))
+                for index in range(zbar_symbol_get_loc_size(symbol))
+            )
+            try:
+                symbol_type = ZBarSymbol(symbol.contents.type).name
+            except ValueError:
+                symbol_type = f"Unrecognised type [{symbol.contents.type}]"
+            orientation = None
+            if zbar_symbol_get_orientation:
+                try:
+                    orientation = ZBarOrientation(zbar_symbol_get_orientation(symbol)).name
+                except ValueError:
+                    # UNKNOWN (-1) comes back as an unsigned int
+                    orientation = ZBarOrientation.UNKNOWN.name
+            decoded.append((
+                string_at(zbar_symbol_get_data(symbol), zbar_symbol_get_data_length(symbol)),
+                symbol_type,
+                tuple((point.x, point.y) for point in polygon),
+                tuple(bounding_box(polygon)),
+                orientation
+            ))
+            symbol = zbar_symbol_next(symbol)
+        return decoded
+
+    def close(self):
+        if self._scanner is not None:
+            zbar_image_destroy(self._image)
+            zbar_image_scanner_destroy(self._scanner)
+            self._scanner = self._image = self._pixels = None
+
+    def __del__(self):
+        self.close()
@@ -1,12 +1,57 @@
+import os
 from PyQt6.QtWidgets import (QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, 
                             QGroupBox, QLabel, QLineEdit, QSlider, QPushButton, 
-                            QFileDialog, QTextEdit, QRadioButton, QButtonGroup)
-from PyQt6.QtCore import Qt, QSize
-from PyQt6.QtGui import QPixmap, QDragEnterEvent, QDropEvent
-import io
-from core.qr_generator import generate_qr
-from core.qr_extractor import extract_qr
+                            QFileDialog, QTextEdit, QRadioButton, QButtonGroup, QComboBox, QTabWidget)
+from PyQt6.QtCore import Qt, QSize, QThreadPool
+from PyQt6.QtGui import QPixmap, QImage, QDragEnterEvent, QDropEvent
+from core.qr_generator import encode_qr, render_qr
+from core.qr_extractor import extract_all_qr
 from core.content_analyzer import ContentAnalyzer
+from core.payload import describe_payload, payload_text
+from gui_workers import LatestJobRunner
+from gui_batch import BatchQueue
+from gui_preview import PreviewCache, to_qimage
+from core.image_loader import read_image_bytes, decode_image, fit_image
+
+# Slider ticks arriving closer together than this are rendered once, with the last value
+RENDER_DEBOUNCE_MS = 30
+
+def decode_image_file(file_path, preview_size, preview_key):
+    """Worker job: read and decode an image file.
+
+    Returns (preview QImage or None when preview_size is None, preview_key,
+    [(payload bytes, display text, formatted analysis), ...] or an error message).
+    """
+    # Decode the file once; the preview and the extractor share the same pixels
+    pixels = decode_image(read_image_bytes(file_path))
+    preview = None
+    if preview_size is not None:
+        preview = to_qimage(fit_image(pixels, preview_size.width(), preview_size.height()))
+
+    # Extract every QR code on the page in one pass using the core function
+    try:
+        decoded = extract_all_qr(pixels)
+        if not decoded:
+            raise ValueError("No QR code found")
+        payloads = [symbol.data for symbol in decoded]
+    except Exception as e:
+        return preview, preview_key, str(e)
+    return preview, preview_key, [
+        (payload, describe_payload(payload), ContentAnalyzer.analyze(payload_text(payload)).format())
+        for payload in payloads
+    ]
+
+def render_code_image(content, error_correction, box_size, border, preview_size):
+    """Worker job: render content (text or payload bytes) as a QR code QImage scaled to preview_size."""
+    # Use the core functions to render the cached module matrix straight into a buffer
+    matrix = encode_qr(content, error_correction)
+    pixels = render_qr(matrix, box_size, border, output='array')
+    height, width = pixels.shape
+
+    # Wrap the pixels without a PNG round trip; scaled() copies them out of the array
+    image = QImage(pixels.data, width, height, pixels.strides[0], QImage.Format.Format_Grayscale8)
+    return image.scaled(preview_size, Qt.AspectRatioMode.KeepAspectRatio,
+                        Qt.TransformationMode.SmoothTransformation)
 
 class QRCodeRebuilder(QMainWindow):
     def __init__(self):
@@ -19,6 +64,18 @@ class QRCodeRebuilder(QMainWindow):
         self.border = 4
         self.error_correction = 'H'
         self.input_image_path = None
+        self.decoded_contents = []
+        self.current_payload = None
+        
+        # Decoding and rendering run on a thread pool so the window stays responsive
+        self.pool = QThreadPool(self)
+        self.previews = PreviewCache()
+        self.decoder = LatestJobRunner(self.pool, parent=self)
+        self.decoder.finished.connect(self.show_decoded_image)
+        self.decoder.failed.connect(self.show_input_error)
+        self.renderer = LatestJobRunner(self.pool, RENDER_DEBOUNCE_MS, parent=self)
+        self.renderer.finished.connect(self.show_generated_code)
+        self.renderer.failed.connect(lambda message: self.output_label.setText(f"Error: {message}"))
         
         self.init_ui()
         
@@ -38,6 +95,12 @@ class QRCodeRebuilder(QMainWindow):
         
         input_layout.addWidget(self.input_label)
         
+        # Code selector, shown when the image holds several QR codes
+        self.code_selector = QComboBox()
+        self.code_selector.currentIndexChanged.connect(self.select_code)
+        self.code_selector.hide()
+        input_layout.addWidget(self.code_selector)
+        
         # Input content area
         self.input_content_single = QLineEdit()
         self.input_content_single.setPlaceholderText("QR Code Content will appear here")
@@ -154,12 +217,24 @@ class QRCodeRebuilder(QMainWindow):
         controls_group.setMaximumHeight(150)
         
         # Main layout
+        main_widget.setLayout(main_layout)
+        
+        # Batch queue tab, sharing the thread pool and the settings below
+        self.batch_queue = BatchQueue(self.pool, self.previews,
+                                      lambda: (self.box_size, self.border, self.error_correction))
+        self.batch_queue.open_requested.connect(self.open_from_queue)
+        
+        self.tabs = QTabWidget()
+        self.tabs.addTab(main_widget, "Single Image")
+        self.tabs.addTab(self.batch_queue, "Batch Queue")
+        
         container = QVBoxLayout()
-        container.addLayout(main_layout)
+        container.addWidget(self.tabs)
         container.addWidget(controls_group)
         
-        main_widget.setLayout(container)
-        self.setCentralWidget(main_widget)
+        central_widget = QWidget()
+        central_widget.setLayout(container)
+        self.setCentralWidget(central_widget)
         
         # Enable drag and drop
         self.setAcceptDrops(True)
@@ -170,11 +245,19 @@ class QRCodeRebuilder(QMainWindow):
             event.acceptProposedAction()
     
     def dropEvent(self, event: QDropEvent):
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')):
-                self.load_input_image(file_path)
-                break
+        paths = [url.toLocalFile() for url in event.mimeData().urls() if url.isLocalFile()]
+        # A single image opens in the single view; several files or folders go to the batch queue
+        if len(paths) == 1 and os.path.isfile(paths[0]) and self.tabs.currentWidget() is not self.batch_queue:
+            if paths[0].lower().endswith(('.png', '.jpg', '.jpeg', '.bmp')):
+                self.load_input_image(paths[0])
+            return
+        if paths:
+            self.tabs.setCurrentWidget(self.batch_queue)
+            self.batch_queue.add_paths(paths)
+    
+    def open_from_queue(self, file_path):
+        self.tabs.setCurrentIndex(0)
+        self.load_input_image(file_path)
     
     def select_input_image(self, event):
         file_path, _ = QFileDialog.getOpenFileName(
@@ -184,32 +267,56 @@ class QRCodeRebuilder(QMainWindow):
             self.load_input_image(file_path)
     
     def load_input_image(self, file_path):
+        """Decode the image in the background; a newer drop supersedes this one."""
         self.input_image_path = file_path
-        pixmap = QPixmap(file_path)
-        self.input_label.setPixmap(
-            pixmap.scaled(
-                self.input_label.size() - QSize(10, 10),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-        )
+        preview_size = self.input_label.size() - QSize(10, 10)
+        preview_key = self.previews.key(file_path, preview_size)
+        cached = self.previews.get(preview_key)
+        if cached is not None:
+            self.input_label.setPixmap(cached)
+        else:
+            self.input_label.clear()
+            self.input_label.setText("Loading...")
+        self.decoder.submit(decode_image_file, file_path, None if cached is not None else preview_size, preview_key)
+    
+    def show_input_error(self, message):
+        self.decoded_contents = []
+        self.current_payload = None
+        self.code_selector.hide()
+        self.input_content_single.setText(f"Error: {message}")
+        self.input_content_structured.clear()
+        if not self.input_label.pixmap() or self.input_label.pixmap().isNull():
+            self.input_label.setText("Drag & drop or click to select image")
+    
+    def show_decoded_image(self, result):
+        preview, preview_key, decoded = result
+        if preview is not None:
+            self.input_label.setPixmap(self.previews.put(preview_key, preview))
+        if isinstance(decoded, str):
+            self.show_input_error(decoded)
+            return
+        self.decoded_contents = decoded
         
-        # Extract QR code content using the core function
-        try:
-            content = extract_qr(file_path)
-            self.input_content_single.setText(content)
-            self.output_content_single.setText(content)
-            self.structure_content(content)
-            self.generate_qr_code(content)
-        except Exception as e:
-            self.input_content_single.setText(f"Error: {str(e)}")
-            self.input_content_structured.clear()
+        self.code_selector.blockSignals(True)
+        self.code_selector.clear()
+        self.code_selector.addItems(
+            [f"Code {i + 1} of {len(self.decoded_contents)}" for i in range(len(self.decoded_contents))]
+        )
+        self.code_selector.blockSignals(False)
+        self.code_selector.setVisible(len(self.decoded_contents) > 1)
+        self.select_code(0)
     
-    def structure_content(self, content):
-        """Format the content in a structured way based on its type."""
-        analysis = ContentAnalyzer.analyze(content)
-        formatted = ContentAnalyzer.format_structured_content(analysis)
+    def select_code(self, index):
+        """Show and rebuild one of the codes decoded from the current image."""
+        if not 0 <= index < len(self.decoded_contents):
+            return
+        payload, text, formatted = self.decoded_contents[index]
+        self.input_content_single.setText(text)
+        self.output_content_single.setText(text)
         self._set_structured_content(formatted)
+        # Rebuild from the decoded bytes, not the displayed text, so nothing is re-encoded
+        self.current_payload = payload
+        self.generate_qr_code(payload)
 
     def _set_structured_content(self, text):
         """Helper to set structured content in both panels."""
@@ -221,22 +328,12 @@ class QRCodeRebuilder(QMainWindow):
         self.regenerate_qr()
     
     def generate_qr_code(self, content):
-        # Use the core function to generate QR code
-        img = generate_qr(content, self.box_size, self.border, self.error_correction)
-        
-        # Convert to QPixmap
-        buffer = io.BytesIO()
-        img.save(buffer, format="PNG")
-        pixmap = QPixmap()
-        pixmap.loadFromData(buffer.getvalue())
-        
-        self.output_label.setPixmap(
-            pixmap.scaled(
-                self.output_label.size() - QSize(10, 10),
-                Qt.AspectRatioMode.KeepAspectRatio,
-                Qt.TransformationMode.SmoothTransformation
-            )
-        )
+        """Render in the background; only the latest settings are rendered during slider drags."""
+        self.renderer.submit(render_code_image, content, self.error_correction, self.box_size, self.border,
+                             self.output_label.size() - QSize(10, 10))
+    
+    def show_generated_code(self, image):
+        self.output_label.setPixmap(QPixmap.fromImage(image))
     
     def update_box_size(self, value):
         self.box_size = value
@@ -269,10 +366,12 @@ class QRCodeRebuilder(QMainWindow):
             pass
     
     def regenerate_qr(self):
-        if self.input_content_single.text() and not self.input_content_single.text().startswith("Error"):
-            self.generate_qr_code(self.input_content_single.text())
+        if self.current_payload is not None:
+            self.generate_qr_code(self.current_payload)
     
     def clear_all(self):
+        self.decoder.cancel()
+        self.renderer.cancel()
         self.input_label.clear()
         self.input_label.setText("Drag & drop or click to select image")
         self.input_content_single.clear()
@@ -280,6 +379,10 @@ class QRCodeRebuilder(QMainWindow):
         self.output_label.clear()
         self.output_content_single.clear()
         self.output_content_structured.clear()
+        self.code_selector.clear()
+        self.code_selector.hide()
+        self.decoded_contents = []
+        self.current_payload = None
         self.input_image_path = None
     
     def save_qr_code(self, file_path=None):
@@ -292,4 +395,13 @@ class QRCodeRebuilder(QMainWindow):
             )
         
         if file_path:
-            self.output_label.pixmap().save(file_path)
\ No newline at end of file
+            self.output_label.pixmap().save(file_path)
+    
+    def closeEvent(self, event):
+        # Let running jobs finish before Qt tears down the objects their signals target
+        self.decoder.cancel()
+        self.renderer.cancel()
+        self.batch_queue.clear()
+        self.pool.clear()
+        self.pool.waitForDone()
+        super().closeEvent(event)
\ No newline at end of file
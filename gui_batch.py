@@ -0,0 +1,210 @@
+import os
+from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListWidget, QListWidgetItem, QProgressBar,
+                             QPushButton, QLabel, QComboBox, QFileDialog)
+from PyQt6.QtCore import QSize, pyqtSignal
+from PyQt6.QtGui import QColor, QIcon
+from core.pipeline import extract_symbols, numbered_output_path
+from core.qr_generator import encode_qr
+from core.payload import describe_payload
+from core.output_sinks import open_sink
+from core.inputs import IMAGE_EXTENSIONS, collect_inputs
+from core.image_loader import read_image_bytes, decode_image
+from gui_workers import FunctionJob, JobSignals, LatestJobRunner
+from gui_preview import to_qimage
+
+THUMBNAIL_SIZE = QSize(48, 48)
+
+# Output formats offered by "Save all" (one file per code in the chosen directory)
+SAVE_FORMATS = ('png', 'jpg', 'bmp', 'svg', 'eps')
+
+def decode_queue_item(path, thumbnail_size):
+    """Worker job: (thumbnail QImage or None, decoded payloads or an error message) for one file.
+
+    The file is read once. The thumbnail comes from a reduced-size decode of those bytes and is
+    skipped when thumbnail_size is None (already cached).
+    """
+    thumbnail = None
+    try:
+        data = read_image_bytes(path)
+        if thumbnail_size is not None:
+            thumbnail = to_qimage(decode_image(data, (thumbnail_size.width(), thumbnail_size.height())))
+        symbols = extract_symbols(data, all_codes=True)
+    except Exception as e:
+        return thumbnail, str(e) or type(e).__name__
+    return thumbnail, [symbol.data for symbol in symbols]
+
+def save_entries(entries, directory, fmt, box_size, border, error_correction):
+    """Worker job: write every decoded code of entries into directory; returns the number written."""
+    written = 0
+    with open_sink(directory, fmt) as sink:
+        for entry in entries:
+            name = os.path.splitext(entry['name'])[0]
+            for index, payload in enumerate(entry['contents']):
+                sink.write(numbered_output_path(name, index, len(entry['contents'])),
+                           encode_qr(payload, error_correction), box_size, border)
+                written += 1
+    return written
+
+class BatchQueue(QWidget):
+    """Queue of dropped files and folders, decoded in parallel on the shared thread pool."""
+    # Emitted with a file path when an item is double-clicked
+    open_requested = pyqtSignal(str)
+
+    def __init__(self, pool, previews, settings, parent=None):
+        """previews is the window's PreviewCache; settings() returns the (box_size, border,
+        error_correction) to save with."""
+        super().__init__(parent)
+        self.pool = pool
+        self.previews = previews
+        self.settings = settings
+        self.entries = []
+        self.jobs = {}
+        self.next_job_id = 0
+        self.done = 0
+        self.failed = 0
+
+        self.signals = JobSignals()
+        self.signals.finished.connect(self.show_result)
+        self.signals.failed.connect(lambda job_id, message: self.show_result(job_id, (None, message)))
+        self.saver = LatestJobRunner(pool, parent=self)
+        self.saver.finished.connect(lambda count: self.status_label.setText(f"Saved {count} codes"))
+        self.saver.failed.connect(lambda message: self.status_label.setText(f"Error: {message}"))
+
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        self.list = QListWidget()
+        self.list.setIconSize(THUMBNAIL_SIZE)
+        self.list.setUniformItemSizes(True)
+        self.list.itemDoubleClicked.connect(
+            lambda item: self.open_requested.emit(self.entries[self.list.row(item)]['path'])
+        )
+        layout.addWidget(self.list)
+
+        self.progress = QProgressBar()
+        self.progress.setFormat("%v / %m")
+        self.progress.setValue(0)
+        layout.addWidget(self.progress)
+
+        self.status_label = QLabel("Drop files or folders here")
+        layout.addWidget(self.status_label)
+
+        button_layout = QHBoxLayout()
+        self.add_files_button = QPushButton("Add Files")
+        self.add_files_button.clicked.connect(self.select_files)
+        button_layout.addWidget(self.add_files_button)
+
+        self.add_folder_button = QPushButton("Add Folder")
+        self.add_folder_button.clicked.connect(self.select_folder)
+        button_layout.addWidget(self.add_folder_button)
+
+        self.clear_button = QPushButton("Clear")
+        self.clear_button.clicked.connect(self.clear)
+        button_layout.addWidget(self.clear_button)
+
+        button_layout.addStretch()
+        button_layout.addWidget(QLabel("Format:"))
+        self.format_selector = QComboBox()
+        self.format_selector.addItems(SAVE_FORMATS)
+        button_layout.addWidget(self.format_selector)
+
+        self.save_all_button = QPushButton("Save All")
+        self.save_all_button.clicked.connect(self.save_all)
+        button_layout.addWidget(self.save_all_button)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def select_files(self):
+        paths, _ = QFileDialog.getOpenFileNames(self, "Select Images", "", "Images (*.png *.jpg *.jpeg *.bmp)")
+        self.add_paths(paths)
+
+    def select_folder(self):
+        directory = QFileDialog.getExistingDirectory(self, "Select Folder")
+        if directory:
+            self.add_paths([directory])
+
+    def add_paths(self, paths):
+        """Queue files and (recursively) the images inside folders, and start decoding them."""
+        if not paths:
+            return
+        known = {os.path.abspath(entry['path']) for entry in self.entries}
+        names = {entry['name'] for entry in self.entries}
+        for path, name in collect_inputs(paths):
+            if os.path.abspath(path) in known or not path.lower().endswith(IMAGE_EXTENSIONS):
+                continue
+            known.add(os.path.abspath(path))
+            # Files from different drops may share a name; keep their outputs apart
+            root, ext = os.path.splitext(name)
+            copy = 1
+            while name in names:
+                copy += 1
+                name = f"{root}_copy{copy}{ext}"
+            names.add(name)
+            item = QListWidgetItem(f"{name} - queued")
+            preview_key = self.previews.key(path, THUMBNAIL_SIZE)
+            thumbnail = self.previews.get(preview_key)
+            if thumbnail is not None:
+                item.setIcon(QIcon(thumbnail))
+            self.list.addItem(item)
+            self.entries.append({'path': path, 'name': name, 'contents': [], 'error': None,
+                                 'preview_key': preview_key})
+            self.next_job_id += 1
+            self.jobs[self.next_job_id] = len(self.entries) - 1
+            task = (path, THUMBNAIL_SIZE if thumbnail is None else None)
+            self.pool.start(FunctionJob(self.next_job_id, decode_queue_item, task, self.signals,
+                                        self.jobs.__contains__))
+        self.update_progress()
+
+    def show_result(self, job_id, result):
+        row = self.jobs.pop(job_id, None)
+        if row is None:
+            return
+        thumbnail, decoded = result
+        entry = self.entries[row]
+        item = self.list.item(row)
+        if thumbnail is not None:
+            item.setIcon(QIcon(self.previews.put(entry['preview_key'], thumbnail)))
+        if isinstance(decoded, str):
+            entry['error'] = decoded
+            item.setText(f"{entry['name']} - error: {decoded}")
+            item.setForeground(QColor('#c00'))
+            self.failed += 1
+        else:
+            entry['contents'] = decoded
+            codes = f"{len(decoded)} codes" if len(decoded) > 1 else "1 code"
+            item.setText(f"{entry['name']} - {codes}: {' | '.join(map(describe_payload, decoded))}")
+        self.done += 1
+        self.update_progress()
+
+    def update_progress(self):
+        self.progress.setMaximum(max(len(self.entries), 1))
+        self.progress.setValue(self.done)
+        self.status_label.setText(
+            f"{self.done} of {len(self.entries)} decoded, {self.failed} failed" if self.entries
+            else "Drop files or folders here"
+        )
+
+    def clear(self):
+        # Queued jobs see they are no longer wanted and skip their work
+        self.jobs.clear()
+        self.saver.cancel()
+        self.entries = []
+        self.done = 0
+        self.failed = 0
+        self.list.clear()
+        self.update_progress()
+
+    def save_all(self):
+        decoded = [entry for entry in self.entries if entry['contents']]
+        if not decoded:
+            return
+        directory = QFileDialog.getExistingDirectory(self, "Save All Codes To")
+        if not directory:
+            return
+        box_size, border, error_correction = self.settings()
+        self.status_label.setText("Saving...")
+        self.saver.submit(save_entries, decoded, directory, self.format_selector.currentText(),
+                          box_size, border, error_correction)
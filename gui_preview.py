@@ -0,0 +1,54 @@
+import os
+from collections import OrderedDict
+from PyQt6.QtGui import QImage, QPixmap
+
+# Previews kept in memory (label previews and queue thumbnails together)
+PREVIEW_CACHE_SIZE = 256
+
+def to_qimage(pixels):
+    """Copy a grayscale or BGR uint8 array into a QImage (safe to build on worker threads)."""
+    height, width = pixels.shape[:2]
+    if pixels.ndim == 2:
+        image_format = QImage.Format.Format_Grayscale8
+    else:
+        image_format = QImage.Format.Format_BGR888
+    # copy() detaches the image from the array, which may be freed once the job returns
+    return QImage(pixels.data, width, height, pixels.strides[0], image_format).copy()
+
+class PreviewCache:
+    """LRU of preview pixmaps keyed by path, modification time and preview size.
+
+    A file changed on disk gets a new key, so stale previews are never shown. GUI thread only.
+    """
+
+    def __init__(self, capacity=PREVIEW_CACHE_SIZE):
+        self.capacity = capacity
+        self.pixmaps = OrderedDict()
+
+    @staticmethod
+    def key(path, size):
+        """Cache key for a preview of path at size (a QSize), or None if the file is unreadable."""
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return None
+        return os.path.abspath(path), mtime, size.width(), size.height()
+
+    def get(self, key):
+        pixmap = self.pixmaps.get(key)
+        if pixmap is not None:
+            self.pixmaps.move_to_end(key)
+        return pixmap
+
+    def put(self, key, image):
+        """Convert a preview QImage to a pixmap, remember it under key and return it."""
+        pixmap = QPixmap.fromImage(image)
+        if key is not None:
+            self.pixmaps[key] = pixmap
+            self.pixmaps.move_to_end(key)
+            while len(self.pixmaps) > self.capacity:
+                self.pixmaps.popitem(last=False)
+        return pixmap
+
+    def clear(self):
+        self.pixmaps.clear()
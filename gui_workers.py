@@ -0,0 +1,93 @@
+from PyQt6.QtCore import QObject, QRunnable, QTimer, pyqtSignal
+
+class JobSignals(QObject):
+    """Carries a job's outcome from a pool thread back to the thread that owns the runner."""
+    finished = pyqtSignal(int, object)
+    failed = pyqtSignal(int, str)
+
+class FunctionJob(QRunnable):
+    """Runs fn(*args) on a QThreadPool unless it went stale while queued."""
+
+    def __init__(self, job_id, fn, args, signals, is_current):
+        super().__init__()
+        self.job_id = job_id
+        self.fn = fn
+        self.args = args
+        self.signals = signals
+        self.is_current = is_current
+
+    def run(self):
+        if not self.is_current(self.job_id):
+            self.signals.failed.emit(self.job_id, '')
+            return
+        try:
+            result = self.fn(*self.args)
+        except Exception as e:
+            self.signals.failed.emit(self.job_id, str(e) or type(e).__name__)
+            return
+        self.signals.finished.emit(self.job_id, result)
+
+class LatestJobRunner(QObject):
+    """Runs one kind of job in a QThreadPool, keeping only the most recent request.
+
+    At most one job runs at a time. Submitting while one runs replaces any waiting job, so
+    bursts (slider drags, repeated drops) are coalesced and only the latest settings are
+    computed. With debounce_ms, a job starts only once submissions pause for that long.
+    finished(result) and failed(message) are emitted on the runner's thread, and only for
+    the latest job; results of superseded or cancelled jobs are dropped.
+    """
+    finished = pyqtSignal(object)
+    failed = pyqtSignal(str)
+
+    def __init__(self, pool, debounce_ms=0, parent=None):
+        super().__init__(parent)
+        self.pool = pool
+        self.job_id = 0
+        self.running = False
+        self._waiting = None
+        self._signals = JobSignals()
+        self._signals.finished.connect(self._on_finished)
+        self._signals.failed.connect(self._on_failed)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setInterval(debounce_ms)
+        self._timer.timeout.connect(self._start_waiting)
+
+    def submit(self, fn, *args):
+        self.job_id += 1
+        self._waiting = (self.job_id, fn, args)
+        if self._timer.interval():
+            self._timer.start()
+        else:
+            self._start_waiting()
+
+    def cancel(self):
+        """Drop the waiting job and ignore the result of the running one."""
+        self.job_id += 1
+        self._waiting = None
+        self._timer.stop()
+
+    def _is_current(self, job_id):
+        return job_id == self.job_id
+
+    def _start_waiting(self):
+        if self.running or self._waiting is None or self._timer.isActive():
+            return
+        job_id, fn, args = self._waiting
+        self._waiting = None
+        self.running = True
+        self.pool.start(FunctionJob(job_id, fn, args, self._signals, self._is_current))
+
+    def _job_done(self):
+        self.running = False
+        self._start_waiting()
+
+    def _on_finished(self, job_id, result):
+        if job_id == self.job_id:
+            self.finished.emit(result)
+        self._job_done()
+
+    def _on_failed(self, job_id, message):
+        if job_id == self.job_id and message:
+            self.failed.emit(message)
+        self._job_done()
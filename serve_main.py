@@ -0,0 +1,17 @@
+import sys
+from multiprocessing import freeze_support
+from cli.argparser import setup_serve_argparser
+from cli.server import serve
+
+def main():
+    parser = setup_serve_argparser()
+    args = parser.parse_args()
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    serve(args.host, args.port, args.workers, args.max_pending, args.max_body, args.timeout)
+    return 0
+
+if __name__ == "__main__":
+    # Required for the process pool in PyInstaller one-file builds
+    freeze_support()
+    sys.exit(main())